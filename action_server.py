@@ -0,0 +1,73 @@
+"""Action server with per-action metrics.
+
+Runs the same Sanic app as ``rasa run actions`` and adds ``GET /metrics``:
+  /metrics              Prometheus text: action_duration_ms{action,phase} histograms,
+                        action_runs_total, action_errors_total, action_slot_events_total
+  /metrics?format=json  per action: runs, errors, slot events and mean/p50/p99 per phase
+
+Phases are ``storage`` (order database, ticket log, FAQ index), ``dispatch`` (building
+responses through the dispatcher) and ``total`` (the whole ``run``). Set
+ACTION_TRACE_FILE to also write each run as OpenTelemetry spans (JSON lines) to that
+file; this needs ``opentelemetry-sdk``.
+
+Startup is kept short: the order file, the FAQ index, the ticket store and dotenv are loaded on
+first use, and (unless ACTIONS_PRELOAD=0) in a background thread right after the server
+starts listening. The log reports how long that took; profile_startup.py breaks it down.
+
+Usage: python action_server.py [--port 5055]
+"""
+import time
+
+STARTED = time.perf_counter()
+
+import argparse
+import logging
+import os
+
+from rasa_sdk.endpoint import create_app
+from sanic import response
+
+logger = logging.getLogger(__name__)
+
+
+def create_metrics_app(action_package: str = "actions"):
+    imported = time.perf_counter()
+    app = create_app(action_package)
+    from actions.actions import warm_up
+    from actions.instrumentation import metrics
+
+    @app.listener("after_server_start")
+    async def report_startup(app, loop):
+        listening = time.perf_counter()
+        logger.info(
+            f"Action server listening {listening - STARTED:.2f}s after start "
+            f"(imports {imported - STARTED:.2f}s, app setup {listening - imported:.2f}s)"
+        )
+        if os.getenv("ACTIONS_PRELOAD", "1") != "0":
+            # Not awaited: requests are served while this runs, and wait for it only
+            # if they need something it has not finished loading
+            preload = loop.run_in_executor(None, warm_up)
+            preload.add_done_callback(
+                lambda done: logger.info(f"Deferred initialization finished in the background: {done.result()} ms")
+            )
+
+    @app.get("/metrics")
+    async def action_metrics(request):
+        if request.args.get("format") == "json":
+            return response.json(metrics.as_dict())
+        return response.text(metrics.prometheus(), content_type="text/plain; version=0.0.4")
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the action server with a /metrics endpoint.")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--actions", default="actions")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    create_metrics_app(args.actions).run(os.getenv("SANIC_HOST", "0.0.0.0"), args.port, workers=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,33 @@ from actions.actions import (
     ActionProcessReturn,
     ValidateOrderStatusForm,
     ValidateReturnForm,
-    ActionDefaultFallback
+    ActionDefaultFallback,
+    ActionStoreOrderId,
+    ActionCreateTicket,
+    ActionAnswerFaq
 )
+from actions.instrumentation import instrument_all, metrics
+
+# Time every action the server registers (see action_server.py for /metrics)
+instrument_all([
+    ActionCheckOrderStatus,
+    ActionProcessReturn,
+    ValidateOrderStatusForm,
+    ValidateReturnForm,
+    ActionDefaultFallback,
+    ActionStoreOrderId,
+    ActionCreateTicket,
+    ActionAnswerFaq
+])
 
 __all__ = [
     'ActionCheckOrderStatus',
     'ActionProcessReturn',
     'ValidateOrderStatusForm',
     'ValidateReturnForm',
-    'ActionDefaultFallback'
-]
\ No newline at end of file
+    'ActionDefaultFallback',
+    'ActionStoreOrderId',
+    'ActionCreateTicket',
+    'ActionAnswerFaq',
+    'metrics'
+]
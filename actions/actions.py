@@ -6,26 +6,47 @@ from rasa_sdk.events import SlotSet, FollowupAction
 import json
 from pathlib import Path
 import os
-from dotenv import load_dotenv
+import threading
+import time
 import uuid
-from datetime import datetime
 from typing import Optional
 
-# Excel logging
-try:
-    from openpyxl import Workbook, load_workbook
-except Exception:
-    Workbook = None
-    load_workbook = None
+from actions.instrumentation import phase, timed
 
-load_dotenv()
+# Heavy dependencies (dotenv; numpy, which faq_index imports only inside FaqIndex) and the
+# order and ticket files are loaded on first use, so the action server answers /health as
+# soon as it is up. rasa-sdk imports every module of this package at startup, so keep
+# their top-level imports cheap.
+_init_lock = threading.RLock()
+_env_loaded = False
+_faq = None
+_tickets = None
+
+
+def load_env():
+    """Read .env once, before the first setting is looked up."""
+    global _env_loaded
+    with _init_lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
 
 
 class OrderDatabase:
     def __init__(self):
-        db_path = os.getenv('ORDER_DATABASE_PATH', './dataset/orders.json')
-        self.db_path = Path(db_path)
-        self.orders = self._load_orders()
+        self.db_path = None
+        self._orders = None
+
+    @property
+    def orders(self):
+        if self._orders is None:
+            with _init_lock:
+                if self._orders is None:
+                    load_env()
+                    self.db_path = Path(os.getenv('ORDER_DATABASE_PATH', './dataset/orders.json'))
+                    self._orders = self._load_orders()
+        return self._orders
     
     def _load_orders(self):
         if self.db_path.exists():
@@ -33,9 +54,11 @@ class OrderDatabase:
                 return json.load(f)
         return {}
     
+    @timed("storage")
     def get_order(self, order_id: str):
         return self.orders.get(order_id)
     
+    @timed("storage")
     def mark_return(self, order_id: str, reason: str):
         if order_id in self.orders:
             self.orders[order_id]['return_requested'] = True
@@ -52,33 +75,103 @@ class OrderDatabase:
 db = OrderDatabase()
 
 
+def get_faq():
+    """The FAQ index, memory-mapped (or built) on first use."""
+    global _faq
+    if _faq is None:
+        with _init_lock:
+            if _faq is None:
+                load_env()
+                from actions.faq_index import FaqIndex
+                _faq = FaqIndex()
+    return _faq
+
+
+def get_tickets():
+    """The ticket store (dataset/tickets.db), opened on first use."""
+    global _tickets
+    if _tickets is None:
+        with _init_lock:
+            if _tickets is None:
+                load_env()
+                from actions.ticket_store import TicketStore
+                _tickets = TicketStore()
+    return _tickets
+
+
+def warm_up() -> Dict[Text, float]:
+    """Load everything deferred above and return how long each part took, in ms.
+
+    action_server.py runs this in the background once /health is up.
+    """
+    timings = {}
+    for label, init in [('env', load_env), ('orders', lambda: db.orders), ('faq_index', get_faq), ('tickets', get_tickets)]:
+        started = time.perf_counter()
+        init()
+        timings[label] = round((time.perf_counter() - started) * 1000, 2)
+    return timings
+
+
+@timed("storage")
 def append_ticket_log(issue_id: str, summary: str, order_id: Optional[str], sender_id: Optional[str]):
-    """Append a ticket entry to dataset/tickets.xlsx. Creates the workbook if missing."""
+    """Record a new open ticket in the ticket store (see actions/ticket_store.py)."""
     try:
-        if Workbook is None:
-            return
-        path = Path('./dataset/tickets.xlsx')
-        if path.exists():
-            wb = load_workbook(path)
-            ws = wb.active
-        else:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = 'tickets'
-            ws.append(['timestamp', 'issue_id', 'order_id', 'sender_id', 'summary'])
-        ws.append([
-            datetime.utcnow().isoformat(timespec='seconds') + 'Z',
-            issue_id,
-            order_id or '',
-            sender_id or '',
-            summary,
-        ])
-        wb.save(path)
+        get_tickets().add(issue_id, summary, order_id, sender_id)
     except Exception:
         # Avoid crashing action on logging errors
         pass
 
 
+@timed("storage")
+def find_open_ticket(order_id: Optional[str]) -> Optional[Dict[Text, Any]]:
+    try:
+        return get_tickets().open_for_order(order_id)
+    except Exception:
+        return None
+
+
+def open_ticket_message(ticket: Dict[Text, Any]) -> Text:
+    opened = (ticket.get('timestamp') or '')[:10]
+    return (
+        f"You already have an open ticket for order {ticket['order_id']}"
+        + (f" (opened {opened})" if opened else "")
+        + ". Our support team is on it, so there's no need to raise another one."
+    )
+
+
+def create_ticket(
+    dispatcher: CollectingDispatcher, tracker: Tracker, latest_text: Text, fallback_count: int = 0
+) -> List[Dict[Text, Any]]:
+    """Open a ticket for the conversation, or point at the order's open one; returns slot events."""
+    # Optionally attach order_id if present; one open ticket per order is enough
+    order_id = tracker.get_slot("order_id")
+    open_ticket = find_open_ticket(order_id)
+    if open_ticket:
+        dispatcher.utter_message(text=open_ticket_message(open_ticket))
+        return [SlotSet("issue_id", open_ticket['issue_id']), SlotSet("fallback_count", fallback_count)]
+
+    # Generate a simple human-readable issue id
+    rand = uuid.uuid4().hex[:6].upper()
+    issue_id = f"ISSUE-{rand}"
+    if order_id:
+        summary = f"Ticket for order {order_id}: {latest_text}"
+    else:
+        summary = latest_text
+
+    # Log ticket to the ticket store and keep chat concise (no ticket id shown)
+    try:
+        append_ticket_log(issue_id, summary, order_id, tracker.sender_id)
+    except Exception:
+        pass
+
+    dispatcher.utter_message(text=(
+        "Thanks, I've created a support ticket and noted your issue. If you have an order ID, I can provide delivery details."
+    ))
+
+    # Store issue_id and a brief summary, and set the caller's fallback counter
+    return [SlotSet("issue_id", issue_id), SlotSet("problem_summary", summary), SlotSet("fallback_count", fallback_count)]
+
+
 class ActionCheckOrderStatus(Action):
     
     def name(self) -> Text:
@@ -124,6 +217,10 @@ class ActionCheckOrderStatus(Action):
             items = order.get('items', [])
             if items:
                 message += f"\nItems: {', '.join(items)}"
+
+            open_ticket = find_open_ticket(order_id)
+            if open_ticket:
+                message += f"\nThere is an open support ticket for this order (opened {open_ticket['timestamp'][:10]})."
         
         else:
             message = f"I'm sorry, I couldn't find any order with ID {order_id}. Please check the order ID and try again."
@@ -256,22 +353,16 @@ class ActionDefaultFallback(Action):
             ))
             return [SlotSet("fallback_count", (fallback_count or 0) + 1)]
 
-        # Otherwise, generate a support ticket once
-        rand = uuid.uuid4().hex[:6].upper()
-        issue_id = f"ISSUE-{rand}"
-        summary = f"Ticket for order {order_id}: {latest_text}" if order_id else latest_text
-
-        # Log ticket to Excel and avoid exposing ticket id in chat
-        try:
-            append_ticket_log(issue_id, summary, order_id, tracker.sender_id)
-        except Exception:
-            pass
-
-        dispatcher.utter_message(text=(
-            "I've created a support ticket and captured your issue details. If you share your order ID, I can provide delivery information."
-        ))
+        # A close FAQ match answers the question without opening a ticket
+        with phase("storage"):
+            faq_match = get_faq().search(latest_text)
+        if faq_match:
+            dispatcher.utter_message(text=faq_match[0])
+            return [SlotSet("fallback_count", (fallback_count or 0) + 1)]
 
-        return [SlotSet("issue_id", issue_id), SlotSet("problem_summary", summary), SlotSet("fallback_count", 1)]
+        # Otherwise open a ticket once (or point at the order's open one); keep the
+        # counter at 1 so the next fallback asks to rephrase instead
+        return create_ticket(dispatcher, tracker, latest_text, fallback_count=1)
 
 
 class ActionStoreOrderId(Action):
@@ -314,27 +405,24 @@ class ActionCreateTicket(Action):
 
         # Build a brief summary from the latest user message
         latest_text = tracker.latest_message.get("text") or "Issue reported"
+        return create_ticket(dispatcher, tracker, latest_text)
 
-        # Generate a simple human-readable issue id
-        rand = uuid.uuid4().hex[:6].upper()
-        issue_id = f"ISSUE-{rand}"
 
-        # Optionally attach order_id if present
-        order_id = tracker.get_slot("order_id")
-        if order_id:
-            summary = f"Ticket for order {order_id}: {latest_text}"
-        else:
-            summary = latest_text
+class ActionAnswerFaq(Action):
+
+    def name(self) -> Text:
+        return "action_answer_faq"
 
-        # Log ticket to Excel and keep chat concise (no ticket id shown)
-        try:
-            append_ticket_log(issue_id, summary, order_id, tracker.sender_id)
-        except Exception:
-            pass
+    def run(self, dispatcher: CollectingDispatcher,
+            tracker: Tracker,
+            domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
-        dispatcher.utter_message(text=(
-            "Thanks, I've created a support ticket and noted your issue. If you have an order ID, I can provide delivery details."
-        ))
+        # Nearest curated Bitext answer; open a ticket right here when nothing is close enough
+        latest_text = tracker.latest_message.get("text") or ""
+        with phase("storage"):
+            faq_match = get_faq().search(latest_text)
+        if not faq_match:
+            return create_ticket(dispatcher, tracker, latest_text or "Issue reported")
 
-        # Store issue_id and a brief summary; also reset fallback counter
-        return [SlotSet("issue_id", issue_id), SlotSet("problem_summary", summary), SlotSet("fallback_count", 0)]
\ No newline at end of file
+        dispatcher.utter_message(text=faq_match[0])
+        return []
\ No newline at end of file
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word unigrams and bigrams."""
+    words = TOKEN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def load_faq_documents(responses_path: Path, pairs_path: Path) -> List[Tuple[str, str]]:
+    """(searchable text, answer) pairs from process_bitext.py output.
+
+    ``bitext_faq.json`` holds utterance/response pairs; ``bitext_responses.json`` holds
+    curated responses per intent, which are indexed by their own text.
+    """
+    documents: List[Tuple[str, str]] = []
+    if pairs_path.exists():
+        with open(pairs_path, 'r', encoding='utf-8') as f:
+            for pair in json.load(f):
+                documents.append((f"{pair.get('utterance', '')} {pair.get('response', '')}", pair.get('response', '')))
+    elif responses_path.exists():
+        with open(responses_path, 'r', encoding='utf-8') as f:
+            for responses in json.load(f).values():
+                documents.extend((response, response) for response in responses)
+    return [(text, answer) for text, answer in documents if answer]
+
+
+class FaqIndex:
+    """TF-IDF inverted index over the Bitext FAQ answers.
+
+    Postings are stored as CSR-style numpy arrays (term -> documents and weights) in
+    ``index_dir`` and memory-mapped on load, so several action server workers share one
+    copy. A query only touches the postings of its own terms, which keeps lookups well
+    under a millisecond for thousands of answers. The index is rebuilt when the source
+    files change.
+
+    numpy is imported inside the methods: rasa-sdk imports every module of the actions
+    package at startup, and this one should not cost anything until the index is used.
+    """
+
+    def __init__(self, index_dir: Optional[str] = None, min_score: Optional[float] = None):
+        import numpy as np
+
+        dataset = Path(os.getenv('FAQ_DATASET_DIR', './dataset'))
+        self.responses_path = dataset / 'bitext_responses.json'
+        self.pairs_path = dataset / 'bitext_faq.json'
+        self.index_dir = Path(index_dir or os.getenv('FAQ_INDEX_DIR', dataset / 'faq_index'))
+        self.min_score = float(min_score if min_score is not None else os.getenv('FAQ_MIN_SCORE', '0.35'))
+        self.vocabulary: Dict[str, int] = {}
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.postings = np.zeros(0, dtype=np.int32)
+        self.weights = np.zeros(0, dtype=np.float32)
+        self.answers: List[str] = []
+        self._load_or_build()
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    def _fingerprint(self) -> str:
+        digest = hashlib.sha256()
+        for path in (self.responses_path, self.pairs_path):
+            if path.exists():
+                digest.update(path.name.encode() + path.read_bytes())
+        return digest.hexdigest()
+
+    def _load_or_build(self):
+        fingerprint = self._fingerprint()
+        meta_path = self.index_dir / 'meta.json'
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                if json.load(f).get('fingerprint') == fingerprint:
+                    self._load()
+                    return
+        except (OSError, ValueError):
+            pass
+        documents = load_faq_documents(self.responses_path, self.pairs_path)
+        if not documents:
+            return
+        self._build(documents)
+        self._save(fingerprint)
+        self._load()
+
+    def _build(self, documents: List[Tuple[str, str]]):
+        import numpy as np
+
+        term_counts = [Counter(tokenize(text)) for text, _ in documents]
+        document_frequency = Counter(term for counts in term_counts for term in counts)
+        n = len(documents)
+        self.vocabulary = {term: i for i, term in enumerate(sorted(document_frequency))}
+        self.idf = np.array(
+            [math.log((1 + n) / (1 + document_frequency[t])) + 1 for t in sorted(document_frequency)],
+            dtype=np.float32,
+        )
+        # Invert document vectors into per-term postings, L2-normalising each document
+        postings: List[List[Tuple[int, float]]] = [[] for _ in self.vocabulary]
+        for doc_id, counts in enumerate(term_counts):
+            vector = {self.vocabulary[t]: (1 + math.log(c)) * self.idf[self.vocabulary[t]] for t, c in counts.items()}
+            norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+            for term_id, weight in vector.items():
+                postings[term_id].append((doc_id, weight / norm))
+        self.indptr = np.cumsum([0] + [len(p) for p in postings]).astype(np.int64)
+        self.postings = np.array([d for p in postings for d, _ in p], dtype=np.int32)
+        self.weights = np.array([w for p in postings for _, w in p], dtype=np.float32)
+        self.answers = [answer for _, answer in documents]
+
+    def _save(self, fingerprint: str):
+        import numpy as np
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        for name in ('idf', 'indptr', 'postings', 'weights'):
+            np.save(self.index_dir / f'{name}.npy', getattr(self, name))
+        with open(self.index_dir / 'vocabulary.json', 'w', encoding='utf-8') as f:
+            json.dump(self.vocabulary, f)
+        with open(self.index_dir / 'answers.json', 'w', encoding='utf-8') as f:
+            json.dump(self.answers, f, ensure_ascii=False)
+        # Written last: a partial index is never mistaken for a complete one
+        with open(self.index_dir / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': fingerprint, 'documents': len(self.answers)}, f)
+
+    def _load(self):
+        import numpy as np
+
+        for name in ('idf', 'indptr', 'postings', 'weights'):
+            setattr(self, name, np.load(self.index_dir / f'{name}.npy', mmap_mode='r'))
+        with open(self.index_dir / 'vocabulary.json', 'r', encoding='utf-8') as f:
+            self.vocabulary = json.load(f)
+        with open(self.index_dir / 'answers.json', 'r', encoding='utf-8') as f:
+            self.answers = json.load(f)
+
+    def search(self, text: str) -> Optional[Tuple[str, float]]:
+        """Best answer and its cosine score, or None if nothing reaches ``min_score``."""
+        import numpy as np
+
+        if not self.answers:
+            return None
+        counts = Counter(t for t in tokenize(text) if t in self.vocabulary)
+        if not counts:
+            return None
+        query = {self.vocabulary[t]: (1 + math.log(c)) * float(self.idf[self.vocabulary[t]]) for t, c in counts.items()}
+        norm = math.sqrt(sum(w * w for w in query.values()))
+        scores = np.zeros(len(self.answers), dtype=np.float32)
+        for term_id, weight in query.items():
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            scores[self.postings[start:end]] += (weight / norm) * self.weights[start:end]
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        if score < self.min_score:
+            return None
+        return self.answers[best], score
@@ -0,0 +1,234 @@
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Text
+
+logger = logging.getLogger(__name__)
+
+PHASES = ("storage", "dispatch", "total")
+# Upper bounds in milliseconds, as in a Prometheus histogram
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_current: ContextVar[Optional["_ActionRun"]] = ContextVar("action_run", default=None)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.total = 0.0
+        self.max = 0.0
+        self.n = 0
+
+    def observe(self, value_ms: float) -> None:
+        i = 0
+        while i < len(BUCKETS_MS) and value_ms > BUCKETS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+        self.n += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (the maximum past the last bucket)."""
+        if not self.n:
+            return 0.0
+        rank, seen = q * self.n, 0
+        for bound, count in zip(BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return round(self.max, 3)
+
+
+class ActionMetrics:
+    """Duration histograms per action and phase, plus run, error and slot-event counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[tuple, Histogram] = defaultdict(Histogram)
+        self.runs: Dict[Text, int] = defaultdict(int)
+        self.errors: Dict[tuple, int] = defaultdict(int)
+        self.slot_events: Dict[Text, int] = defaultdict(int)
+
+    def record(self, action: Text, phases: Dict[Text, float], slot_events: int, error: Optional[Text]) -> None:
+        with self._lock:
+            self.runs[action] += 1
+            self.slot_events[action] += slot_events
+            for phase in PHASES:
+                self.histograms[(action, phase)].observe(phases.get(phase, 0.0))
+            if error:
+                self.errors[(action, error)] += 1
+
+    def as_dict(self) -> Dict[Text, Any]:
+        with self._lock:
+            actions = {}
+            for action, runs in sorted(self.runs.items()):
+                actions[action] = {
+                    "runs": runs,
+                    "errors": sum(n for (a, _), n in self.errors.items() if a == action),
+                    "slot_events": self.slot_events[action],
+                    **{
+                        phase: {
+                            "mean_ms": round(self.histograms[(action, phase)].total / runs, 3),
+                            "p50_ms": self.histograms[(action, phase)].quantile(0.5),
+                            "p99_ms": self.histograms[(action, phase)].quantile(0.99),
+                        }
+                        for phase in PHASES
+                    },
+                }
+            return actions
+
+    def prometheus(self) -> Text:
+        """Prometheus text exposition format."""
+        lines = ["# TYPE action_duration_ms histogram"]
+        with self._lock:
+            for (action, phase), histogram in sorted(self.histograms.items()):
+                labels = f'action="{action}",phase="{phase}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS_MS, histogram.counts):
+                    cumulative += count
+                    lines.append(f'action_duration_ms_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'action_duration_ms_bucket{{{labels},le="+Inf"}} {histogram.n}')
+                lines.append(f"action_duration_ms_sum{{{labels}}} {round(histogram.total, 3)}")
+                lines.append(f"action_duration_ms_count{{{labels}}} {histogram.n}")
+            lines.append("# TYPE action_runs_total counter")
+            for action, runs in sorted(self.runs.items()):
+                lines.append(f'action_runs_total{{action="{action}"}} {runs}')
+            lines.append("# TYPE action_errors_total counter")
+            for (action, error), n in sorted(self.errors.items()):
+                lines.append(f'action_errors_total{{action="{action}",error="{error}"}} {n}')
+            lines.append("# TYPE action_slot_events_total counter")
+            for action, n in sorted(self.slot_events.items()):
+                lines.append(f'action_slot_events_total{{action="{action}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = ActionMetrics()
+
+
+def _tracer():
+    """A tracer exporting to ACTION_TRACE_FILE, or None when tracing is off."""
+    path = os.getenv("ACTION_TRACE_FILE")
+    if not path:
+        return None
+    # OpenTelemetry is optional and only imported when tracing is on
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except Exception:
+        logger.warning("ACTION_TRACE_FILE is set but opentelemetry-sdk is not installed; spans are not exported.")
+        return None
+    provider = TracerProvider(resource=Resource.create({"service.name": "rasa-action-server"}))
+    exporter = ConsoleSpanExporter(
+        out=open(path, "a", encoding="utf-8"),
+        formatter=lambda span: span.to_json(indent=None) + "\n",
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    return provider.get_tracer(__name__)
+
+
+tracer = _tracer()
+
+
+class _ActionRun:
+    def __init__(self, action: Text):
+        self.action = action
+        self.phases: Dict[Text, float] = defaultdict(float)
+
+
+@contextmanager
+def phase(name: Text):
+    """Attribute the enclosed time to ``name`` for the action currently running."""
+    run = _current.get()
+    if run is None:
+        yield
+        return
+    span = tracer.start_as_current_span(f"{run.action}.{name}") if tracer else None
+    started = time.perf_counter()
+    try:
+        if span is None:
+            yield
+        else:
+            with span:
+                yield
+    finally:
+        run.phases[name] += (time.perf_counter() - started) * 1000
+
+
+def timed(name: Text) -> Callable:
+    """Decorator form of ``phase``."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _count_slot_events(events: Any) -> int:
+    return sum(1 for e in events or [] if isinstance(e, dict) and e.get("event") == "slot")
+
+
+def _time_dispatcher(dispatcher: Any) -> None:
+    # The dispatcher is created per request, so shadowing the bound method is enough
+    utter_message = dispatcher.utter_message
+    dispatcher.utter_message = timed("dispatch")(utter_message)
+
+
+@contextmanager
+def _action_run(action: Text, dispatcher: Any):
+    run = _ActionRun(action)
+    token = _current.set(run)
+    _time_dispatcher(dispatcher)
+    span = tracer.start_as_current_span(action) if tracer else None
+    started = time.perf_counter()
+    outcome = {"events": None, "error": None}
+    try:
+        if span is None:
+            yield outcome
+        else:
+            with span:
+                yield outcome
+    except Exception as e:
+        outcome["error"] = type(e).__name__
+        raise
+    finally:
+        run.phases["total"] = (time.perf_counter() - started) * 1000
+        _current.reset(token)
+        metrics.record(action, run.phases, _count_slot_events(outcome["events"]), outcome["error"])
+
+
+def instrument(action_class: type) -> type:
+    """Wrap ``action_class.run`` so every call is timed by phase and counted."""
+    run = action_class.run
+    if getattr(run, "__instrumented__", False):
+        return action_class
+
+    if inspect.iscoroutinefunction(run):
+        @functools.wraps(run)
+        async def wrapper(self, dispatcher, tracker, domain):
+            with _action_run(self.name(), dispatcher) as outcome:
+                outcome["events"] = await run(self, dispatcher, tracker, domain)
+                return outcome["events"]
+    else:
+        @functools.wraps(run)
+        def wrapper(self, dispatcher, tracker, domain):
+            with _action_run(self.name(), dispatcher) as outcome:
+                outcome["events"] = run(self, dispatcher, tracker, domain)
+                return outcome["events"]
+
+    wrapper.__instrumented__ = True
+    action_class.run = wrapper
+    return action_class
+
+
+def instrument_all(action_classes: Iterable[type]) -> List[type]:
+    return [instrument(cls) for cls in action_classes]
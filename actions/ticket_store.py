@@ -0,0 +1,200 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Text
+
+COLUMNS = ('issue_id', 'timestamp', 'order_id', 'sender_id', 'summary', 'status')
+OPEN = 'open'
+CLOSED = 'closed'
+
+
+def utc_now() -> Text:
+    return datetime.utcnow().isoformat(timespec='seconds') + 'Z'
+
+
+class TicketStore:
+    """Support tickets in SQLite with secondary indexes on order, sender and time.
+
+    Every query is an index range scan: (order_id, timestamp), (sender_id, timestamp)
+    and (timestamp) are B-tree indexes, so lookups read only the matching rows and stay
+    flat as the table grows into the millions. WAL mode lets the dashboards read while
+    the action server writes. On first use an existing ``tickets.xlsx`` is imported.
+    """
+
+    def __init__(self, path: Optional[Text] = None, workbook: Optional[Text] = None):
+        dataset = Path(os.getenv('TICKET_DATASET_DIR', './dataset'))
+        self.path = Path(path or os.getenv('TICKET_DB_PATH', dataset / 'tickets.db'))
+        self.workbook = Path(workbook or dataset / 'tickets.xlsx')
+        self._mutex = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        created = not self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tickets'"
+        ).fetchone()
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tickets (
+                issue_id TEXT PRIMARY KEY,
+                timestamp TEXT NOT NULL,
+                order_id TEXT,
+                sender_id TEXT,
+                summary TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'open'
+            );
+            CREATE INDEX IF NOT EXISTS tickets_order ON tickets (order_id, timestamp);
+            CREATE INDEX IF NOT EXISTS tickets_sender ON tickets (sender_id, timestamp);
+            CREATE INDEX IF NOT EXISTS tickets_timestamp ON tickets (timestamp);
+        """)
+        if created and self.workbook.exists():
+            self.import_workbook(self.workbook)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._mutex:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _select(self, where: Text, params: tuple, limit: Optional[int]) -> List[Dict[Text, Any]]:
+        # Timestamps have one-second resolution; rowid (insertion order) breaks ties and,
+        # as the last column of every index, keeps the sort inside the index scan
+        sql = f"SELECT {', '.join(COLUMNS)} FROM tickets WHERE {where} ORDER BY timestamp DESC, rowid DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._mutex:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def add(self, issue_id: Text, summary: Text, order_id: Optional[Text] = None,
+            sender_id: Optional[Text] = None, status: Text = OPEN, timestamp: Optional[Text] = None) -> Dict[Text, Any]:
+        ticket = {
+            'issue_id': issue_id,
+            'timestamp': timestamp or utc_now(),
+            'order_id': order_id or None,
+            'sender_id': sender_id or None,
+            'summary': summary,
+            'status': status,
+        }
+        with self._transaction() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO tickets ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                tuple(ticket[c] for c in COLUMNS),
+            )
+        return ticket
+
+    def get(self, issue_id: Text) -> Optional[Dict[Text, Any]]:
+        rows = self._select("issue_id = ?", (issue_id,), 1)
+        return rows[0] if rows else None
+
+    def set_status(self, issue_id: Text, status: Text) -> bool:
+        with self._transaction() as conn:
+            return conn.execute("UPDATE tickets SET status = ? WHERE issue_id = ?", (status, issue_id)).rowcount > 0
+
+    def close(self, issue_id: Text) -> bool:
+        """Mark a ticket resolved, so the next issue for its order opens a new one."""
+        return self.set_status(issue_id, CLOSED)
+
+    def close_for_order(self, order_id: Text) -> int:
+        """Close every open ticket of an order; returns how many were closed."""
+        with self._transaction() as conn:
+            return conn.execute(
+                "UPDATE tickets SET status = ? WHERE order_id = ? AND status = ?", (CLOSED, order_id, OPEN)
+            ).rowcount
+
+    def by_order(self, order_id: Text, status: Optional[Text] = None, limit: Optional[int] = 50) -> List[Dict[Text, Any]]:
+        """Tickets for an order, newest first."""
+        if status:
+            return self._select("order_id = ? AND status = ?", (order_id, status), limit)
+        return self._select("order_id = ?", (order_id,), limit)
+
+    def by_sender(self, sender_id: Text, status: Optional[Text] = None, limit: Optional[int] = 50) -> List[Dict[Text, Any]]:
+        """Tickets raised in a conversation, newest first."""
+        if status:
+            return self._select("sender_id = ? AND status = ?", (sender_id, status), limit)
+        return self._select("sender_id = ?", (sender_id,), limit)
+
+    def between(self, start: Text, end: Optional[Text] = None, limit: Optional[int] = 1000) -> List[Dict[Text, Any]]:
+        """Tickets with ``start <= timestamp < end`` (ISO 8601, UTC), newest first."""
+        if end:
+            return self._select("timestamp >= ? AND timestamp < ?", (start, end), limit)
+        return self._select("timestamp >= ?", (start,), limit)
+
+    def open_for_order(self, order_id: Optional[Text]) -> Optional[Dict[Text, Any]]:
+        """The most recent open ticket for an order, if any."""
+        if not order_id:
+            return None
+        rows = self.by_order(order_id, status=OPEN, limit=1)
+        return rows[0] if rows else None
+
+    def count(self) -> int:
+        with self._mutex:
+            return self._conn.execute("SELECT COUNT(*) FROM tickets").fetchone()[0]
+
+    def import_workbook(self, path: Path) -> int:
+        """Copy rows from a tickets.xlsx written by earlier versions; returns the row count."""
+        try:
+            from openpyxl import load_workbook
+        except Exception:
+            return 0
+        rows = load_workbook(path, read_only=True).active.iter_rows(min_row=2, values_only=True)
+        tickets = [
+            (str(issue_id), str(timestamp), str(order_id) if order_id else None,
+             str(sender_id) if sender_id else None, str(summary or ''), OPEN)
+            for timestamp, issue_id, order_id, sender_id, summary, *_ in rows
+            if issue_id
+        ]
+        with self._transaction() as conn:
+            conn.executemany(
+                f"INSERT OR IGNORE INTO tickets ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                tickets,
+            )
+        return len(tickets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query and resolve logged support tickets.")
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument("--order", help="Tickets for an order ID")
+    query.add_argument("--sender", help="Tickets for a conversation (sender ID)")
+    query.add_argument("--since", help="Tickets created at or after this ISO timestamp")
+    query.add_argument("--import-xlsx", help="Import a tickets.xlsx workbook")
+    query.add_argument("--close", metavar="ISSUE_ID", help="Mark a ticket resolved")
+    query.add_argument("--close-order", metavar="ORDER_ID", help="Mark every open ticket of an order resolved")
+    parser.add_argument("--until", help="With --since: tickets created before this ISO timestamp")
+    parser.add_argument("--status", choices=[OPEN, CLOSED])
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    store = TicketStore()
+    if args.import_xlsx:
+        print(f"Imported {store.import_workbook(Path(args.import_xlsx))} tickets into {store.path}")
+        return
+    if args.close:
+        if not store.close(args.close):
+            raise SystemExit(f"No ticket {args.close}")
+        print(json.dumps(store.get(args.close), indent=2))
+        return
+    if args.close_order:
+        print(f"Closed {store.close_for_order(args.close_order)} tickets for order {args.close_order}")
+        return
+    if args.order:
+        tickets = store.by_order(args.order, args.status, args.limit)
+    elif args.sender:
+        tickets = store.by_sender(args.sender, args.status, args.limit)
+    else:
+        tickets = store.between(args.since, args.until, args.limit)
+    print(json.dumps(tickets, indent=2))
+
+
+if __name__ == "__main__":
+    main()
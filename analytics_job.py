@@ -0,0 +1,239 @@
+"""Incremental conversation analytics over the event broker queue.
+
+Consumes tracker events written by brokers.sqlite_broker.SQLiteQueueEventBroker (see
+endpoints.yml) from the last committed offset and updates daily counters in
+analytics/analytics.db:
+  fallback rate    user messages classified nlu_fallback / all user messages
+  form completion  per form: started, completed (the form deactivated itself),
+                   abandoned (action_deactivate_loop, restart or a new session)
+  ticket funnel    conversations -> issue raised (report_issue, out_of_scope or
+                   nlu_fallback) -> ticket created (problem_summary set, which only a
+                   new ticket does; reusing an open one sets issue_id alone), plus FAQ
+                   answers given instead of a ticket
+
+Per-conversation state (active form, funnel stage) is kept between runs, so each event
+is read once; counters and the offset are committed together. Consumed events are also
+archived as gzipped JSONL segments in --export-dir.
+
+Usage:
+  python analytics_job.py [--queue events.db] [--days 7]
+  python analytics_job.py --watch 60          # keep consuming every 60 s
+  python analytics_job.py --prune             # delete archived events from the queue
+"""
+import argparse
+import gzip
+import json
+import sqlite3
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+ROOT = Path(__file__).parent.resolve()
+CONSUMER = "analytics_job"
+ISSUE_INTENTS = {"report_issue", "out_of_scope", "nlu_fallback"}
+# Funnel stages, in order; each conversation reaches each stage at most once
+STAGES = ["conversations", "issue_raised", "ticket_created"]
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), isolation_level=None)
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        CREATE TABLE IF NOT EXISTS offsets (consumer TEXT PRIMARY KEY, last_id INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS counters (
+            day TEXT NOT NULL, metric TEXT NOT NULL, key TEXT NOT NULL, value INTEGER NOT NULL,
+            PRIMARY KEY (day, metric, key)
+        );
+        CREATE TABLE IF NOT EXISTS conversations (
+            sender_id TEXT PRIMARY KEY, active_form TEXT, last_action TEXT, stage INTEGER NOT NULL
+        );
+    """)
+    return conn
+
+
+def day_of(timestamp: Optional[float]) -> str:
+    moment = datetime.fromtimestamp(timestamp, timezone.utc) if timestamp else datetime.now(timezone.utc)
+    return moment.date().isoformat()
+
+
+class Aggregator:
+    """Folds a batch of events into counter increments and updated conversation state."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.counts: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self.state: Dict[str, Dict[str, Any]] = {}
+
+    def _conversation(self, sender_id: str) -> Dict[str, Any]:
+        if sender_id not in self.state:
+            row = self.conn.execute(
+                "SELECT active_form, last_action, stage FROM conversations WHERE sender_id = ?", (sender_id,)
+            ).fetchone()
+            self.state[sender_id] = (
+                {"active_form": row[0], "last_action": row[1], "stage": row[2]}
+                if row else {"active_form": None, "last_action": None, "stage": -1}
+            )
+        return self.state[sender_id]
+
+    def _reach(self, conversation: Dict[str, Any], stage: str, day: str) -> None:
+        index = STAGES.index(stage)
+        # A later stage implies the earlier ones (e.g. a ticket from a button press)
+        while conversation["stage"] < index:
+            conversation["stage"] += 1
+            self.counts[(day, "funnel", STAGES[conversation["stage"]])] += 1
+
+    def _end_form(self, conversation: Dict[str, Any], outcome: str, day: str) -> None:
+        if conversation["active_form"]:
+            self.counts[(day, f"form_{outcome}", conversation["active_form"])] += 1
+            conversation["active_form"] = None
+
+    def add(self, event: Dict[str, Any]) -> None:
+        conversation = self._conversation(event.get("sender_id", ""))
+        day = day_of(event.get("timestamp"))
+        kind = event.get("event")
+
+        if kind in ("session_started", "restart"):
+            self._end_form(conversation, "abandoned", day)
+            conversation["stage"] = -1
+        elif kind == "user":
+            intent = ((event.get("parse_data") or {}).get("intent") or {}).get("name")
+            self.counts[(day, "user_messages", "")] += 1
+            if intent == "nlu_fallback":
+                self.counts[(day, "fallbacks", "")] += 1
+            self._reach(conversation, "conversations", day)
+            if intent in ISSUE_INTENTS:
+                self._reach(conversation, "issue_raised", day)
+        elif kind == "action":
+            conversation["last_action"] = event.get("name")
+            if event.get("name") == "action_answer_faq":
+                self.counts[(day, "faq_answers", "")] += 1
+        elif kind == "active_loop":
+            name = event.get("name")
+            if name and name != conversation["active_form"]:
+                self._end_form(conversation, "abandoned", day)
+                conversation["active_form"] = name
+                self.counts[(day, "form_started", name)] += 1
+            elif not name:
+                deactivated = conversation["last_action"] == "action_deactivate_loop"
+                self._end_form(conversation, "abandoned" if deactivated else "completed", day)
+        elif kind == "slot" and event.get("name") == "problem_summary" and event.get("value"):
+            # Only the creation path sets problem_summary; issue_id is also set for a reused ticket
+            self._reach(conversation, "ticket_created", day)
+
+    def commit(self, last_id: int) -> None:
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.executemany(
+            "INSERT INTO counters (day, metric, key, value) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (day, metric, key) DO UPDATE SET value = value + excluded.value",
+            [(day, metric, key, n) for (day, metric, key), n in self.counts.items()],
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO conversations (sender_id, active_form, last_action, stage) VALUES (?, ?, ?, ?)",
+            [(s, c["active_form"], c["last_action"], c["stage"]) for s, c in self.state.items()],
+        )
+        self.conn.execute("INSERT OR REPLACE INTO offsets (consumer, last_id) VALUES (?, ?)", (CONSUMER, last_id))
+        self.conn.execute("COMMIT")
+
+
+def consume(queue: sqlite3.Connection, conn: sqlite3.Connection, export_dir: Optional[Path], batch_size: int) -> int:
+    """Process everything after the committed offset; returns the number of events."""
+    total = 0
+    while True:
+        row = conn.execute("SELECT last_id FROM offsets WHERE consumer = ?", (CONSUMER,)).fetchone()
+        offset = row[0] if row else 0
+        rows = queue.execute(
+            "SELECT id, body FROM events WHERE id > ? ORDER BY id LIMIT ?", (offset, batch_size)
+        ).fetchall()
+        if not rows:
+            return total
+        if export_dir:
+            export_dir.mkdir(parents=True, exist_ok=True)
+            # Named by the first id, so a batch retried after a crash overwrites itself
+            with gzip.open(export_dir / f"events-{rows[0][0]:012d}.jsonl.gz", "wt", encoding="utf-8") as f:
+                f.writelines(body + "\n" for _, body in rows)
+        aggregator = Aggregator(conn)
+        for _, body in rows:
+            aggregator.add(json.loads(body))
+        aggregator.commit(rows[-1][0])
+        total += len(rows)
+
+
+def report(conn: sqlite3.Connection, days: int) -> Dict[str, Any]:
+    since = (datetime.now(timezone.utc).date() - timedelta(days=days - 1)).isoformat()
+    counts: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for metric, key, value in conn.execute(
+        "SELECT metric, key, SUM(value) FROM counters WHERE day >= ? GROUP BY metric, key", (since,)
+    ):
+        counts[metric][key] = value
+
+    user_messages = counts["user_messages"][""]
+    forms = {}
+    for form in sorted(set(counts["form_started"]) | set(counts["form_completed"])):
+        started = counts["form_started"][form]
+        forms[form] = {
+            "started": started,
+            "completed": counts["form_completed"][form],
+            "abandoned": counts["form_abandoned"][form],
+            "completion_rate": round(counts["form_completed"][form] / started, 4) if started else None,
+        }
+    funnel = {stage: counts["funnel"][stage] for stage in STAGES}
+    conversions = {
+        f"{a}->{b}": round(funnel[b] / funnel[a], 4) if funnel[a] else None
+        for a, b in zip(STAGES, STAGES[1:])
+    }
+    return {
+        "since": since,
+        "user_messages": user_messages,
+        "fallback_rate": round(counts["fallbacks"][""] / user_messages, 4) if user_messages else None,
+        "forms": forms,
+        "ticket_funnel": {**funnel, "conversion": conversions, "faq_answers": counts["faq_answers"][""]},
+    }
+
+
+def prune(queue: sqlite3.Connection, conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT last_id FROM offsets WHERE consumer = ?", (CONSUMER,)).fetchone()
+    if not row:
+        return 0
+    return queue.execute("DELETE FROM events WHERE id <= ?", (row[0],)).rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate broker events into conversation metrics.")
+    parser.add_argument("--queue", default=str(ROOT / "events.db"), help="Event broker SQLite queue")
+    parser.add_argument("--state", default=str(ROOT / "analytics" / "analytics.db"))
+    parser.add_argument("--export-dir", default=str(ROOT / "analytics" / "events"))
+    parser.add_argument("--no-export", action="store_true", help="Do not archive consumed events")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=7, help="Report window in days")
+    parser.add_argument("--watch", type=float, default=0, help="Keep consuming every N seconds")
+    parser.add_argument("--prune", action="store_true", help="Delete consumed events from the queue")
+    args = parser.parse_args()
+
+    if not Path(args.queue).exists():
+        raise SystemExit(f"No event queue at {args.queue}; enable event_broker in endpoints.yml first.")
+    queue = sqlite3.connect(args.queue, timeout=10.0, isolation_level=None)
+    conn = connect(Path(args.state))
+    export_dir = None if args.no_export else Path(args.export_dir)
+
+    while True:
+        started = time.perf_counter()
+        consumed = consume(queue, conn, export_dir, args.batch_size)
+        pruned = prune(queue, conn) if args.prune else 0
+        result = report(conn, args.days)
+        result["job"] = {
+            "consumed": consumed,
+            "pruned": pruned,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        print(json.dumps(result, indent=2))
+        if not args.watch:
+            break
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    main()
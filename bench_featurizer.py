@@ -0,0 +1,109 @@
+"""Compare CountVectorsFeaturizer with the fixed-size HashingFeaturizer.
+
+For each variant the NLU model is trained on the same 80% split of the training data
+(data/nlu.yml + data/nlu_from_bitext.yml) and evaluated on the remaining 20%.
+Reports model size, training time, per-message inference latency and intent F1.
+
+Usage: python bench_featurizer.py [--epochs 50] [--n-features 65536]
+"""
+import argparse
+import asyncio
+import copy
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+
+ROOT = Path(__file__).parent.resolve()
+COUNT_VECTORS = ("CountVectorsFeaturizer", "components.fast_path.FastPathCountVectorsFeaturizer")
+
+
+def variant_config(base: dict, featurizer: str, n_features: int, epochs: int = None) -> dict:
+    config = copy.deepcopy(base)
+    pipeline = []
+    for component in config["pipeline"]:
+        if component["name"] in COUNT_VECTORS and featurizer == "hashing":
+            component = {
+                "name": "components.hashing_featurizer.HashingFeaturizer",
+                "analyzer": component.get("analyzer", "char_wb"),
+                "min_ngram": component.get("min_ngram", 1),
+                "max_ngram": component.get("max_ngram", 4),
+                "n_features": n_features,
+            }
+        if epochs and "epochs" in component:
+            component = {**component, "epochs": epochs}
+        pipeline.append(component)
+    config["pipeline"] = pipeline
+    return config
+
+
+def rasa(*args: str) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "rasa", *args], cwd=ROOT, check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+async def inference_ms(model: Path, texts) -> float:
+    from rasa.core.agent import Agent
+
+    if not texts:
+        return 0.0
+    agent = Agent.load(str(model))
+    for text in texts[:10]:
+        await agent.parse_message(text)
+    started = time.perf_counter()
+    for text in texts:
+        await agent.parse_message(text)
+    return (time.perf_counter() - started) * 1000 / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hashing vs count-vector featurization.")
+    parser.add_argument("--epochs", type=int, default=None, help="Override epochs for a quicker comparison")
+    parser.add_argument("--n-features", type=int, default=2 ** 16)
+    args = parser.parse_args()
+
+    with open(ROOT / "config.yml", "r", encoding="utf-8") as f:
+        base = yaml.safe_load(f)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        rasa("data", "split", "nlu", "--nlu", "data", "--training-fraction", "0.8",
+             "--random-seed", "42", "--out", str(tmp / "split"))
+        train_file = next((tmp / "split").glob("training_data.*"))
+        test_file = next((tmp / "split").glob("test_data.*"))
+        test_texts = [
+            line.strip()[2:] for line in test_file.read_text(encoding="utf-8").splitlines()
+            if line.strip().startswith("- ") and "[" not in line
+        ]
+
+        for name in ["count_vectors", "hashing"]:
+            config_path = tmp / f"config_{name}.yml"
+            config = variant_config(base, "hashing" if name == "hashing" else "count", args.n_features, args.epochs)
+            config_path.write_text(yaml.safe_dump(config, sort_keys=False), encoding="utf-8")
+
+            train_seconds = rasa("train", "nlu", "--config", str(config_path), "--nlu", str(train_file),
+                                 "--out", str(tmp / "models"), "--fixed-model-name", name)
+            model = tmp / "models" / f"{name}.tar.gz"
+            rasa("test", "nlu", "--model", str(model), "--nlu", str(test_file), "--out", str(tmp / f"results_{name}"))
+            report = json.loads((tmp / f"results_{name}" / "intent_report.json").read_text(encoding="utf-8"))
+
+            results.append({
+                "featurizer": name,
+                "model_megabytes": round(model.stat().st_size / 1e6, 2),
+                "train_seconds": round(train_seconds, 1),
+                "inference_ms_per_message": round(asyncio.run(inference_ms(model, test_texts)), 2),
+                "intent_f1_weighted": round(report["weighted avg"]["f1-score"], 4),
+            })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
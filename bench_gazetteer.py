@@ -0,0 +1,76 @@
+"""Compare the Aho-Corasick gazetteer with lookup-table regexes for product names.
+
+Builds a synthetic catalogue (plus the real items from dataset/orders.json), then times
+building and matching for both approaches. The regex mirrors what RegexEntityExtractor
+compiles from a lookup table: one case-insensitive alternation with word boundaries.
+
+Usage: python bench_gazetteer.py [--products 1000,10000,50000] [--messages 2000]
+"""
+import argparse
+import json
+import random
+import re
+import time
+
+from components.aho_corasick import AhoCorasick
+from components.catalogue import load_catalogue
+
+BRANDS = ["Acme", "Zento", "Orbit", "Nimbus", "Vertex", "Pulse", "Lumen", "Kestrel", "Nova", "Quill"]
+KINDS = ["Wireless Mouse", "USB-C Cable", "Laptop Stand", "Bluetooth Speaker", "Keyboard", "Monitor Arm",
+         "Webcam", "Headset", "Charger", "Docking Station", "Phone Case", "Desk Lamp"]
+TEMPLATES = [
+    "my {p} arrived damaged",
+    "where is the {p} I ordered",
+    "I want to return the {p} from order 12345",
+    "can you check on my order please",
+    "the {p} and the {q} never showed up",
+]
+
+
+def synthetic_catalogue(count: int):
+    names = set(load_catalogue("dataset/orders.json", None))
+    while len(names) < count:
+        names.add(f"{random.choice(BRANDS)} {random.choice(KINDS)} {random.randint(1, 9999)}")
+    return sorted(names)
+
+
+def regex_lookup(names):
+    # Same shape as RegexEntityExtractor's lookup regex
+    return re.compile("|".join(rf"\b{re.escape(name)}\b" for name in names), re.IGNORECASE)
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def bench(count: int, messages: int):
+    names = synthetic_catalogue(count)
+    texts = [random.choice(TEMPLATES).format(p=random.choice(names), q=random.choice(names)) for _ in range(messages)]
+
+    automaton, ac_build = timed(AhoCorasick, names)
+    pattern, re_build = timed(regex_lookup, names)
+
+    _, ac_match = timed(lambda: [automaton.find(t) for t in texts])
+    _, re_match = timed(lambda: [list(pattern.finditer(t)) for t in texts])
+    return {
+        "products": count,
+        "aho_corasick": {"build_ms": round(ac_build, 1), "match_us_per_message": round(ac_match * 1000 / messages, 1)},
+        "regex_lookup": {"build_ms": round(re_build, 1), "match_us_per_message": round(re_match * 1000 / messages, 1)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark gazetteer matching.")
+    parser.add_argument("--products", default="1000,10000,50000")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    results = [bench(int(n), args.messages) for n in args.products.split(",") if n.strip()]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""Replay realistic conversations against the bot at a target rate and report latency.
+
+Conversations are synthesized from data/stories.yml and tests/test_stories.yml. User text
+comes from the story itself (test stories) or from a training example of the intent in
+data/nlu.yml, and order IDs are drawn from dataset/orders.json.
+
+Modes:
+  rest  - drive Rasa core through /webhooks/rest/webhook (default)
+  stub  - skip core and call the action server's /webhook directly with synthesized
+          trackers, to benchmark custom actions on their own; when the server is
+          action_server.py its per-action phase breakdown is added to the report
+
+Usage:
+  python bench_load.py --rate 20 --duration 60
+  python bench_load.py --mode stub --url http://localhost:5055/webhook --rate 100
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+import aiohttp
+import yaml
+
+
+ROOT = Path(__file__).parent.resolve()
+STORY_FILES = [ROOT / "data" / "stories.yml", ROOT / "tests" / "test_stories.yml"]
+NLU_FILE = ROOT / "data" / "nlu.yml"
+DOMAIN_FILE = ROOT / "domain.yml"
+ORDERS_FILE = ROOT / "dataset" / "orders.json"
+
+# [text](entity) annotations in training data
+ENTITY_MARKUP = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+ORDER_ID = re.compile(r"\b\d{5}\b")
+
+
+def load_yaml(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def load_intent_examples() -> Dict[str, List[str]]:
+    """Map intent -> plain-text training examples with entity markup removed."""
+    examples: Dict[str, List[str]] = defaultdict(list)
+    for item in load_yaml(NLU_FILE).get("nlu", []):
+        intent = item.get("intent")
+        if not intent:
+            continue
+        for line in str(item.get("examples", "")).splitlines():
+            line = line.strip()
+            if line.startswith("- "):
+                examples[intent].append(ENTITY_MARKUP.sub(r"\1", line[2:]))
+    return examples
+
+
+def load_order_ids() -> List[str]:
+    if ORDERS_FILE.exists():
+        with open(ORDERS_FILE, "r") as f:
+            return list(json.load(f).keys())
+    return ["12345"]
+
+
+class Turn:
+    """One user message plus the bot actions the story expects in response."""
+
+    def __init__(self, text: str, intent: str, entities: Dict[str, str]):
+        self.text = text
+        self.intent = intent
+        self.entities = entities
+        self.actions: List[str] = []
+        self.slots: Dict[str, Any] = {}
+
+
+def _entities_of(step: Dict[str, Any]) -> Dict[str, str]:
+    entities: Dict[str, str] = {}
+    for e in step.get("entities") or []:
+        if not isinstance(e, dict):
+            continue
+        if "entity" in e:
+            entities[e["entity"]] = str(e.get("value", ""))
+        else:
+            # Short form used in stories: - order_id: "12345"
+            entities.update({k: str(v) for k, v in e.items()})
+    return entities
+
+
+def load_stories() -> List[List[Turn]]:
+    """Parse story files into lists of turns."""
+    stories = []
+    for path in STORY_FILES:
+        if not path.exists():
+            continue
+        for story in load_yaml(path).get("stories", []):
+            turns: List[Turn] = []
+            for step in story.get("steps", []):
+                if "intent" in step:
+                    text = ENTITY_MARKUP.sub(r"\1", str(step.get("user", "")).strip())
+                    turns.append(Turn(text, step["intent"], _entities_of(step)))
+                elif "action" in step and turns:
+                    turns[-1].actions.append(step["action"])
+                elif "slot_was_set" in step and turns:
+                    for slot in step["slot_was_set"]:
+                        if isinstance(slot, dict):
+                            turns[-1].slots.update(slot)
+            if turns:
+                stories.append(turns)
+    return stories
+
+
+class ConversationFactory:
+    """Instantiate stories with fresh sender IDs, varied phrasings and real order IDs."""
+
+    def __init__(self, stories: List[List[Turn]], examples: Dict[str, List[str]], order_ids: List[str]):
+        self.stories = stories
+        self.examples = examples
+        self.order_ids = order_ids
+
+    def text_for(self, turn: Turn, order_id: str) -> str:
+        text = turn.text
+        if not text:
+            candidates = self.examples.get(turn.intent) or [turn.intent.replace("_", " ")]
+            text = random.choice(candidates)
+            if "order_id" in turn.entities and not ORDER_ID.search(text):
+                text = f"{text} {order_id}" if turn.intent != "provide_order_id" else order_id
+        return ORDER_ID.sub(order_id, text)
+
+    def build(self) -> List[Dict[str, Any]]:
+        story = random.choice(self.stories)
+        order_id = random.choice(self.order_ids)
+        turns = []
+        for turn in story:
+            slots = {k: (order_id if k == "order_id" else v) for k, v in turn.slots.items()}
+            entities = {k: (order_id if k == "order_id" else v) for k, v in turn.entities.items()}
+            turns.append({
+                "text": self.text_for(turn, order_id),
+                "intent": turn.intent,
+                "entities": entities,
+                "actions": list(turn.actions),
+                "slots": slots,
+            })
+        return turns
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.requests = 0
+
+    def record(self, label: str, elapsed_ms: float, ok: bool):
+        self.requests += 1
+        self.latencies[label].append(elapsed_ms)
+        if not ok:
+            self.errors[label] += 1
+
+    def report(self, wall_seconds: float) -> Dict[str, Any]:
+        def pct(values: List[float], q: float) -> float:
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+        rows = {}
+        for label, values in sorted(self.latencies.items()):
+            rows[label] = {
+                "count": len(values),
+                "p50_ms": pct(values, 0.50),
+                "p95_ms": pct(values, 0.95),
+                "p99_ms": pct(values, 0.99),
+                "mean_ms": round(statistics.fmean(values), 1),
+                "error_rate": round(self.errors[label] / len(values), 4),
+            }
+        total_errors = sum(self.errors.values())
+        return {
+            "requests": self.requests,
+            "wall_seconds": round(wall_seconds, 2),
+            "throughput_rps": round(self.requests / wall_seconds, 2) if wall_seconds else 0.0,
+            "error_rate": round(total_errors / self.requests, 4) if self.requests else 0.0,
+            "by_label": rows,
+        }
+
+
+async def timed_post(session: aiohttp.ClientSession, url: str, payload: Dict[str, Any], stats: Stats, label: str) -> Optional[Any]:
+    started = time.perf_counter()
+    ok = False
+    body = None
+    try:
+        async with session.post(url, json=payload) as resp:
+            body = await resp.json(content_type=None)
+            ok = resp.status < 400
+    except Exception:
+        ok = False
+    stats.record(label, (time.perf_counter() - started) * 1000, ok)
+    return body
+
+
+async def run_rest_conversation(session, url: str, turns: List[Dict[str, Any]], stats: Stats, think_time: float):
+    sender = f"load-{uuid4().hex[:10]}"
+    for turn in turns:
+        await timed_post(session, url, {"sender": sender, "message": turn["text"]}, stats, f"intent:{turn['intent']}")
+        if think_time:
+            await asyncio.sleep(random.uniform(0, think_time))
+
+
+def action_server_payload(action: str, sender: str, turn: Dict[str, Any], slots: Dict[str, Any], domain: Dict[str, Any]) -> Dict[str, Any]:
+    """Synthesize the request core would send to the action server for ``action``."""
+    events = [{"event": "user", "text": turn["text"], "parse_data": {"intent": {"name": turn["intent"]}}}]
+    # Form validators only look at slot events that follow the latest user message
+    events += [{"event": "slot", "name": k, "value": v} for k, v in turn["slots"].items()]
+    return {
+        "next_action": action,
+        "sender_id": sender,
+        "version": "3.6.2",
+        "domain": domain,
+        "tracker": {
+            "sender_id": sender,
+            "slots": dict(slots),
+            "latest_message": {
+                "text": turn["text"],
+                "intent": {"name": turn["intent"], "confidence": 1.0},
+                "entities": [{"entity": k, "value": v} for k, v in turn["entities"].items()],
+            },
+            "latest_event_time": time.time(),
+            "followup_action": None,
+            "paused": False,
+            "events": events,
+            "latest_input_channel": "rest",
+            "active_loop": {},
+            "latest_action": {"action_name": "action_listen"},
+            "latest_action_name": "action_listen",
+        },
+    }
+
+
+async def run_stub_conversation(session, url: str, turns: List[Dict[str, Any]], stats: Stats, think_time: float, domain: Dict[str, Any]):
+    sender = f"load-{uuid4().hex[:10]}"
+    custom_actions = set(domain.get("actions") or [])
+    forms = set((domain.get("forms") or {}).keys())
+    slots: Dict[str, Any] = {}
+    for turn in turns:
+        slots.update(turn["entities"])
+        slots.update(turn["slots"])
+        for action in turn["actions"]:
+            if action in forms:
+                action = f"validate_{action}"
+            if action not in custom_actions:
+                continue
+            await timed_post(session, url, action_server_payload(action, sender, turn, slots, domain), stats, f"action:{action}")
+        if think_time:
+            await asyncio.sleep(random.uniform(0, think_time))
+
+
+async def action_metrics(webhook_url: str) -> Optional[Dict[str, Any]]:
+    """Per-action phase timings from action_server.py, if it is the server under test."""
+    url = webhook_url.rsplit("/webhook", 1)[0] + "/metrics?format=json"
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as resp:
+                return await resp.json() if resp.status == 200 else None
+    except aiohttp.ClientError:
+        return None
+
+
+async def drive(args) -> Dict[str, Any]:
+    factory = ConversationFactory(load_stories(), load_intent_examples(), load_order_ids())
+    domain = load_yaml(DOMAIN_FILE)
+    stats = Stats()
+    connector = aiohttp.TCPConnector(limit=args.connections, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(sock_connect=3.05, sock_read=args.read_timeout)
+    in_flight: set = set()
+    # Bound concurrent conversations so an overloaded server sheds load instead of the client
+    gate = asyncio.Semaphore(args.max_conversations)
+
+    async def one(session):
+        async with gate:
+            turns = factory.build()
+            if args.mode == "stub":
+                await run_stub_conversation(session, args.url, turns, stats, args.think_time, domain)
+            else:
+                await run_rest_conversation(session, args.url, turns, stats, args.think_time)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        while time.perf_counter() < deadline:
+            task = asyncio.ensure_future(one(session))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            # Poisson arrivals at the target conversation rate
+            await asyncio.sleep(random.expovariate(args.rate))
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        wall = time.perf_counter() - started
+
+    report = stats.report(wall)
+    report.update({"mode": args.mode, "url": args.url, "target_conversations_per_sec": args.rate})
+    if args.mode == "stub":
+        report["actions"] = await action_metrics(args.url)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay story-based conversations against the bot.")
+    parser.add_argument("--mode", choices=["rest", "stub"], default="rest")
+    parser.add_argument("--url", default=None, help="Webhook URL (defaults per mode)")
+    parser.add_argument("--rate", type=float, default=5.0, help="New conversations per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate new conversations")
+    parser.add_argument("--connections", type=int, default=50, help="Connection pool size")
+    parser.add_argument("--max-conversations", type=int, default=200, help="Concurrent conversation cap")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Max random pause between turns (s)")
+    parser.add_argument("--read-timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default=None, help="Optional path to write the JSON report")
+    args = parser.parse_args()
+    if args.url is None:
+        args.url = "http://localhost:5055/webhook" if args.mode == "stub" else "http://localhost:5006/webhooks/rest/webhook"
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    report = asyncio.run(drive(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
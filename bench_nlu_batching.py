@@ -0,0 +1,80 @@
+"""Throughput/latency curve of micro-batched NLU inference across batching windows.
+
+Loads the model once, then for each window size runs ``--clients`` concurrent callers
+that each parse ``--requests`` utterances through a MicroBatcher. A window of 0 with
+max batch 1 is the unbatched baseline.
+
+Usage: python bench_nlu_batching.py [--windows 0,1,2,5,10,20] [--clients 32]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from rasa.core.agent import Agent
+
+from bench_load import load_intent_examples
+from nlu_server import MicroBatcher
+from run_all import MODELS_DIR, latest_model_tar
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+
+async def run(agent, texts, window_ms: float, max_batch: int, clients: int, requests: int):
+    batcher = MicroBatcher(agent, window_ms, max_batch)
+    batcher.start()
+    latencies = []
+
+    async def client():
+        for _ in range(requests):
+            started = time.perf_counter()
+            await batcher.parse(random.choice(texts))
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(clients)])
+    wall = time.perf_counter() - started
+    stats = batcher.stats()
+    await batcher.stop()
+    return {
+        "window_ms": window_ms,
+        "max_batch": max_batch,
+        "throughput_per_sec": round(len(latencies) / wall, 1),
+        "mean_batch_size": stats["mean_batch_size"],
+        "p50_ms": percentile(latencies, 0.5),
+        "p99_ms": percentile(latencies, 0.99),
+    }
+
+
+async def main_async(args):
+    agent = Agent.load(args.model)
+    texts = [text for examples in load_intent_examples().values() for text in examples]
+    # Trace the TensorFlow graph for batch sizes before timing anything
+    await run(agent, texts, 5, args.max_batch, args.clients, 2)
+    results = [await run(agent, texts, 0, 1, args.clients, args.requests)]
+    for window in args.windows:
+        results.append(await run(agent, texts, window, args.max_batch, args.clients, args.requests))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NLU micro-batching windows.")
+    default_model = MODELS_DIR / "production.tar.gz"
+    parser.add_argument("--model", default=str(default_model if default_model.exists() else latest_model_tar()))
+    parser.add_argument("--windows", default="0,1,2,5,10,20", help="Comma-separated windows in ms")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per client")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    args.windows = [float(w) for w in args.windows.split(",") if w.strip()]
+    random.seed(args.seed)
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Measure NLU parse latency with the parse-result cache on and off.
+
+Loads a trained model in-process and parses a Zipf-distributed stream of training
+utterances (a few phrasings dominate, as in real traffic) twice: once with the cache
+disabled and once enabled. Reports hit ratio and p50/p99 latency for each run.
+
+Usage: python bench_parse_cache.py [--model models/production.tar.gz] [--messages 5000]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from rasa.core.agent import Agent
+
+from components.parse_cache import cache
+from bench_load import load_intent_examples
+from run_all import MODELS_DIR, latest_model_tar
+
+
+def utterance_stream(count: int, skew: float):
+    utterances = [text for examples in load_intent_examples().values() for text in examples]
+    random.shuffle(utterances)
+    weights = [1.0 / (rank + 1) ** skew for rank in range(len(utterances))]
+    return random.choices(utterances, weights=weights, k=count)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+
+async def run(agent: Agent, stream, enabled: bool):
+    cache.enabled = enabled
+    cache.entries.clear()
+    cache.hits = cache.misses = 0
+    latencies = []
+    for text in stream:
+        started = time.perf_counter()
+        await agent.parse_message(text)
+        latencies.append((time.perf_counter() - started) * 1000)
+    total = cache.hits + cache.misses
+    return {
+        "cache": "on" if enabled else "off",
+        "messages": len(stream),
+        "hit_ratio": round(cache.hits / total, 4) if total else 0.0,
+        "p50_ms": percentile(latencies, 0.5),
+        "p99_ms": percentile(latencies, 0.99),
+    }
+
+
+async def main_async(args):
+    agent = Agent.load(args.model)
+    stream = utterance_stream(args.messages, args.skew)
+    # Warm up TensorFlow so neither run pays first-call costs
+    for text in stream[:20]:
+        await agent.parse_message(text)
+    return [await run(agent, stream, False), await run(agent, stream, True)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the NLU parse cache.")
+    default_model = MODELS_DIR / "production.tar.gz"
+    parser.add_argument("--model", default=str(default_model if default_model.exists() else latest_model_tar()))
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of phrase popularity")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    print(json.dumps(asyncio.run(main_async(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark ticket lookups as the ticket store grows.
+
+Fills a fresh TicketStore in steps up to --tickets synthetic tickets (spread over
+--orders orders and --senders conversations). At each size it times by_order,
+by_sender, open_for_order and a one-hour between() window on random keys, and prints
+the query plans to show that each one is an index search.
+
+Usage: python bench_ticket_store.py --tickets 1000000 --samples 2000
+"""
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from actions.ticket_store import CLOSED, COLUMNS, OPEN, TicketStore
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def fill(store: TicketStore, start: int, stop: int, orders: int, senders: int, epoch: datetime):
+    batch = []
+    for i in range(start, stop):
+        batch.append((
+            f"ISSUE-{i:08X}",
+            (epoch + timedelta(seconds=30 * i)).isoformat(timespec='seconds') + 'Z',
+            str(10000 + i % orders),
+            f"sender-{i % senders}",
+            f"Synthetic ticket {i}",
+            OPEN if random.random() < 0.2 else CLOSED,
+        ))
+    with store._transaction() as conn:
+        conn.executemany(f"INSERT INTO tickets ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)", batch)
+
+
+def timed_ms(fn, keys):
+    samples = []
+    for key in keys:
+        started = time.perf_counter()
+        fn(key)
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"p50_ms": round(statistics.median(samples), 4), "p99_ms": round(percentile(samples, 0.99), 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ticket store lookups.")
+    parser.add_argument("--tickets", type=int, default=1_000_000)
+    parser.add_argument("--orders", type=int, default=200_000)
+    parser.add_argument("--senders", type=int, default=300_000)
+    parser.add_argument("--samples", type=int, default=2000)
+    args = parser.parse_args()
+
+    epoch = datetime(2024, 1, 1)
+    sizes = [n for n in (10_000, 100_000, 1_000_000, 10_000_000) if n < args.tickets] + [args.tickets]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TicketStore(str(Path(tmp) / "tickets.db"), workbook=str(Path(tmp) / "none.xlsx"))
+        filled = 0
+        for size in sizes:
+            fill(store, filled, size, args.orders, args.senders, epoch)
+            filled = size
+            orders = [str(10000 + random.randrange(min(size, args.orders))) for _ in range(args.samples)]
+            senders = [f"sender-{random.randrange(min(size, args.senders))}" for _ in range(args.samples)]
+            hours = [
+                (epoch + timedelta(seconds=30 * random.randrange(size))).isoformat(timespec='seconds') + 'Z'
+                for _ in range(args.samples)
+            ]
+            results.append({
+                "tickets": size,
+                "by_order": timed_ms(store.by_order, orders),
+                "by_sender": timed_ms(store.by_sender, senders),
+                "open_for_order": timed_ms(store.open_for_order, orders),
+                "between_1h": timed_ms(
+                    lambda start: store.between(start, (datetime.fromisoformat(start[:-1]) + timedelta(hours=1)).isoformat() + 'Z'),
+                    hours,
+                ),
+            })
+            print(json.dumps(results[-1]))
+
+        plans = {}
+        for label, sql, params in [
+            ("by_order", "SELECT * FROM tickets WHERE order_id = ? AND status = ? ORDER BY timestamp DESC, rowid DESC", ("10000", OPEN)),
+            ("by_sender", "SELECT * FROM tickets WHERE sender_id = ? ORDER BY timestamp DESC, rowid DESC", ("sender-1",)),
+            ("between", "SELECT * FROM tickets WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp DESC, rowid DESC", ("2024", "2025")),
+        ]:
+            plans[label] = [row[-1] for row in store._conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        print(json.dumps({"query_plans": plans, "db_megabytes": round(store.path.stat().st_size / 1e6, 1)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
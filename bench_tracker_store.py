@@ -0,0 +1,192 @@
+"""Benchmark tracker retrieve/save latency of the compacting SQL tracker store.
+
+Populates a fresh SQLite store with N synthetic conversations, then times retrieve and
+save on randomly chosen senders and reports the database size and process RSS. The
+default of 40 turns per conversation is past keep_turns + compact_every, so populating
+already compacts every conversation.
+
+--soak-turns runs long conversations instead: every sender gets one turn per round,
+and every --report-every rounds the stored rows per sender, live database size,
+retrieve latency and RSS are reported. It fails unless compaction kept the rows per
+sender bounded and every reloaded tracker still has the order_id it was last given.
+
+Usage: python bench_tracker_store.py --conversations 100000 --turns 40 --samples 2000
+       python bench_tracker_store.py --soak-turns 300 --conversations 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import resource
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import sqlalchemy as sa
+from rasa.shared.core.domain import Domain
+from rasa.shared.core.events import ActionExecuted, SessionStarted, SlotSet, UserUttered
+
+from stores.tracker_store import CompactingSQLTrackerStore
+
+
+ROOT = Path(__file__).parent.resolve()
+INTENTS = ["greet", "ask_order_status", "provide_order_id", "affirm", "thank", "goodbye"]
+
+
+def conversation_turn(turn: int):
+    intent = INTENTS[turn % len(INTENTS)]
+    events = [
+        UserUttered(f"message {turn}", intent={"name": intent, "confidence": 1.0}),
+        ActionExecuted("action_check_order_status" if intent == "affirm" else f"utter_{intent}"),
+    ]
+    if intent == "provide_order_id":
+        events.append(SlotSet("order_id", f"{random.randint(10000, 99999)}"))
+    events.append(ActionExecuted("action_listen"))
+    return events
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+
+async def populate(store, conversations: int, turns: int):
+    for n in range(conversations):
+        tracker = await store.get_or_create_tracker(f"bench-{n}", append_action_listen=False)
+        tracker.update(ActionExecuted("action_session_start"))
+        tracker.update(SessionStarted())
+        tracker.update(ActionExecuted("action_listen"))
+        for t in range(turns):
+            for event in conversation_turn(t):
+                tracker.update(event)
+        await store.save(tracker)
+
+
+async def measure(store, conversations: int, samples: int):
+    retrieve_ms, save_ms = [], []
+    for _ in range(samples):
+        sender = f"bench-{random.randrange(conversations)}"
+        started = time.perf_counter()
+        tracker = await store.retrieve(sender)
+        retrieve_ms.append((time.perf_counter() - started) * 1000)
+        for event in conversation_turn(random.randrange(len(INTENTS))):
+            tracker.update(event)
+        started = time.perf_counter()
+        await store.save(tracker)
+        save_ms.append((time.perf_counter() - started) * 1000)
+    return retrieve_ms, save_ms
+
+
+def stored_rows(store) -> list:
+    with store.session_scope() as session:
+        query = session.query(store.SQLEvent.sender_id, sa.func.count()).group_by(store.SQLEvent.sender_id)
+        return [count for _, count in query.all()]
+
+
+def live_megabytes(db: Path) -> float:
+    # Deleted rows leave free pages behind; count only the pages in use
+    conn = sqlite3.connect(str(db))
+    try:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        pages = conn.execute("PRAGMA page_count").fetchone()[0] - conn.execute("PRAGMA freelist_count").fetchone()[0]
+    finally:
+        conn.close()
+    return round(pages * page_size / 1e6, 2)
+
+
+async def soak(store, db: Path, args):
+    senders = [f"bench-{n}" for n in range(args.conversations)]
+    await populate(store, args.conversations, 0)
+    # Every turn adds at most this many events (see conversation_turn)
+    events_per_turn = 4
+    bound = (args.keep_turns + args.compact_every) * events_per_turn + len(store.domain.slots) + 4
+    checkpoints = []
+    expected = {}
+    for turn in range(1, args.soak_turns + 1):
+        retrieve_ms = []
+        for sender in senders:
+            started = time.perf_counter()
+            tracker = await store.retrieve(sender)
+            retrieve_ms.append((time.perf_counter() - started) * 1000)
+            for event in conversation_turn(turn):
+                tracker.update(event)
+            expected[sender] = tracker.get_slot("order_id")
+            await store.save(tracker)
+        if turn % args.report_every == 0 or turn == args.soak_turns:
+            rows = stored_rows(store)
+            checkpoints.append({
+                "turns": turn,
+                "rows_per_sender_max": max(rows),
+                "rows_per_sender_mean": round(statistics.fmean(rows), 1),
+                "live_db_megabytes": live_megabytes(db),
+                "retrieve_ms_p50": percentile(retrieve_ms, 0.5),
+                "retrieve_ms_p99": percentile(retrieve_ms, 0.99),
+                "max_rss_megabytes": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            })
+            print(json.dumps(checkpoints[-1]))
+    stale = [sender for sender in senders if (await store.retrieve(sender)).get_slot("order_id") != expected[sender]]
+    if stale:
+        raise SystemExit(f"Compaction lost slot values: {len(stale)} trackers reload a stale order_id.")
+    final = checkpoints[-1]
+    uncompacted = args.soak_turns * 3
+    if final["rows_per_sender_max"] > bound or final["rows_per_sender_max"] >= uncompacted:
+        raise SystemExit(
+            f"Compaction did not bound the history: {final['rows_per_sender_max']} rows per sender "
+            f"after {args.soak_turns} turns (bound {bound}, uncompacted at least {uncompacted})."
+        )
+    return {
+        "conversations": args.conversations,
+        "soak_turns": args.soak_turns,
+        "keep_turns": args.keep_turns,
+        "compact_every": args.compact_every,
+        "rows_per_sender_bound": bound,
+        "checkpoints": checkpoints,
+    }
+
+
+async def run(args):
+    domain = Domain.load(str(ROOT / "domain.yml"))
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "bench.db"
+        store = CompactingSQLTrackerStore(
+            domain=domain, dialect="sqlite", db=str(db),
+            keep_turns=args.keep_turns, compact_every=args.compact_every,
+        )
+        if args.soak_turns:
+            return await soak(store, db, args)
+        started = time.perf_counter()
+        await populate(store, args.conversations, args.turns)
+        populate_s = time.perf_counter() - started
+        retrieve_ms, save_ms = await measure(store, args.conversations, args.samples)
+        return {
+            "conversations": args.conversations,
+            "turns_per_conversation": args.turns,
+            "keep_turns": args.keep_turns,
+            "populate_seconds": round(populate_s, 1),
+            "db_megabytes": round(db.stat().st_size / 1e6, 1),
+            "retrieve_ms": {"p50": percentile(retrieve_ms, 0.5), "p99": percentile(retrieve_ms, 0.99), "mean": round(statistics.fmean(retrieve_ms), 3)},
+            "save_ms": {"p50": percentile(save_ms, 0.5), "p99": percentile(save_ms, 0.99), "mean": round(statistics.fmean(save_ms), 3)},
+            # ru_maxrss is KiB on Linux
+            "max_rss_megabytes": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compacting SQL tracker store.")
+    parser.add_argument("--conversations", type=int, default=100_000)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--keep-turns", type=int, default=10)
+    parser.add_argument("--compact-every", type=int, default=20)
+    parser.add_argument("--soak-turns", type=int, default=0, help="Run the soak mode with this many turns per conversation")
+    parser.add_argument("--report-every", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
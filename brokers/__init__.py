@@ -0,0 +1,5 @@
+from brokers.sqlite_broker import SQLiteQueueEventBroker
+
+__all__ = [
+    'SQLiteQueueEventBroker'
+]
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Text
+
+from rasa.core.brokers.broker import EventBroker
+from rasa.utils.endpoints import EndpointConfig
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def connect(db: Text, timeout: float = 10.0) -> sqlite3.Connection:
+    """Open the queue database and create the events table if needed."""
+    conn = sqlite3.connect(db, timeout=timeout, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS events ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " sender_id TEXT NOT NULL,"
+        " event TEXT NOT NULL,"
+        " timestamp REAL,"
+        " body TEXT NOT NULL)"
+    )
+    return conn
+
+
+class SQLiteQueueEventBroker(EventBroker):
+    """Tracker-event broker backed by a local SQLite queue, standing in for Kafka/RabbitMQ.
+
+    ``publish`` only puts the event on an in-memory queue, so message handling never
+    waits on disk. A background thread drains the queue every ``flush_interval``
+    seconds or ``batch_size`` events and appends the batch to the ``events`` table in a
+    single transaction; rows get increasing ids, which consumers such as
+    ``analytics_job.py`` use as offsets. If the writer falls ``max_queue`` events behind,
+    new events are dropped and counted rather than slowing the bot down.
+    """
+
+    def __init__(
+        self,
+        db: Text = "events.db",
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_queue: int = 100000,
+    ) -> None:
+        self.db = db
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=int(max_queue))
+        self._conn = connect(db)
+        self._writer = threading.Thread(target=self._run, name="event-broker-writer", daemon=True)
+        self._writer.start()
+
+    @classmethod
+    async def from_endpoint_config(
+        cls,
+        broker_config: EndpointConfig,
+        event_loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> "SQLiteQueueEventBroker":
+        return cls(**broker_config.kwargs)
+
+    def publish(self, event: Dict[Text, Any]) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Event broker queue is full; {self.dropped} events dropped so far.")
+
+    def is_ready(self) -> bool:
+        return self._writer.is_alive()
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            # Wait for the writer to make room without blocking the event loop
+            await loop.run_in_executor(None, self._queue.put, _STOP)
+        await loop.run_in_executor(None, self._writer.join, 10.0)
+        self._conn.close()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Dict[Text, Any]] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[Dict[Text, Any]]) -> None:
+        rows = [
+            (
+                str(event.get("sender_id", "")),
+                str(event.get("event", "")),
+                event.get("timestamp"),
+                json.dumps(event, separators=(",", ":"), default=str),
+            )
+            for event in batch
+        ]
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT INTO events (sender_id, event, timestamp, body) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.execute("COMMIT")
+            self.written += len(rows)
+        except sqlite3.Error as e:
+            # Losing analytics is better than losing the writer thread
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            self.dropped += len(rows)
+            logger.warning(f"Event broker could not write {len(rows)} events: {e}")
@@ -0,0 +1,5 @@
+from channels.sse import SSEInput
+
+__all__ = [
+    'SSEInput'
+]
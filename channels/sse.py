@@ -0,0 +1,101 @@
+import asyncio
+import inspect
+import json
+import time
+from asyncio import Queue
+from typing import Any, Awaitable, Callable, Optional, Text
+
+from sanic import Blueprint, response
+from sanic.request import Request
+from sanic.response import HTTPResponse
+
+from rasa.core.channels.channel import UserMessage
+from rasa.core.channels.rest import QueueOutputChannel, RestInput
+
+
+DONE = "DONE"
+
+
+def sse_frame(data: Any, event: Optional[str] = None) -> str:
+    """Encode one Server-Sent Events frame."""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data)}\n\n"
+
+
+class SSEInput(RestInput):
+    """REST-compatible channel that streams each bot message as soon as it is dispatched.
+
+    POST ``/webhooks/sse/webhook`` with the same ``{"sender", "message"}`` body as the REST
+    channel. The response is ``text/event-stream``: one ``message`` event per bot message
+    (flushed after every action run), followed by a ``done`` event carrying timing info.
+    """
+
+    @classmethod
+    def name(cls) -> Text:
+        return "sse"
+
+    @staticmethod
+    async def on_message_wrapper(
+        on_new_message: Callable[[UserMessage], Awaitable[Any]],
+        text: Text,
+        queue: Queue,
+        sender_id: Text,
+        input_channel: Text,
+        metadata: Optional[dict],
+    ) -> None:
+        collector = QueueOutputChannel(queue)
+        message = UserMessage(text, collector, sender_id, input_channel=input_channel, metadata=metadata)
+        try:
+            await on_new_message(message)
+        finally:
+            # Always release the reader, even if message handling failed
+            await queue.put(DONE)
+
+    def blueprint(self, on_new_message: Callable[[UserMessage], Awaitable[Any]]) -> Blueprint:
+        sse_webhook = Blueprint(
+            "custom_webhook_{}".format(type(self).__name__),
+            inspect.getmodule(self).__name__,
+        )
+
+        @sse_webhook.route("/", methods=["GET"])
+        async def health(request: Request) -> HTTPResponse:
+            return response.json({"status": "ok"})
+
+        @sse_webhook.route("/webhook", methods=["POST"])
+        async def receive(request: Request) -> None:
+            sender_id = await self._extract_sender(request)
+            text = self._extract_message(request)
+            input_channel = self._extract_input_channel(request)
+            metadata = self.get_metadata(request)
+
+            started = time.perf_counter()
+            stream = await request.respond(
+                content_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+            queue: Queue = Queue()
+            task = asyncio.ensure_future(
+                self.on_message_wrapper(on_new_message, text, queue, sender_id, input_channel, metadata)
+            )
+            first_message_ms = None
+            count = 0
+            try:
+                while True:
+                    result = await queue.get()
+                    if result == DONE:
+                        break
+                    if first_message_ms is None:
+                        first_message_ms = (time.perf_counter() - started) * 1000
+                    count += 1
+                    await stream.send(sse_frame(result, "message"))
+                await task
+            except Exception as e:
+                await stream.send(sse_frame({"error": str(e)}, "error"))
+            await stream.send(sse_frame({
+                "messages": count,
+                "first_message_ms": first_message_ms,
+                "total_ms": (time.perf_counter() - started) * 1000,
+            }, "done"))
+            await stream.eof()
+
+        return sse_webhook
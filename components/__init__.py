@@ -0,0 +1,38 @@
+import importlib
+
+# Resolved on first access: fast_path pulls in DIET and TensorFlow, which tools that only
+# need components.aho_corasick (bench_gazetteer.py) should not pay for
+_EXPORTS = {
+    'FastPathRouter': 'components.fast_path',
+    'FastPathRegexFeaturizer': 'components.fast_path',
+    'FastPathLexicalSyntacticFeaturizer': 'components.fast_path',
+    'FastPathCountVectorsFeaturizer': 'components.fast_path',
+    'FastPathDIETClassifier': 'components.fast_path',
+    'FastPathResponseSelector': 'components.fast_path',
+    'ParseCacheLookup': 'components.parse_cache',
+    'ParseCacheWriter': 'components.parse_cache',
+    'HashingFeaturizer': 'components.hashing_featurizer',
+    'GazetteerEntityExtractor': 'components.gazetteer'
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    'FastPathRouter',
+    'FastPathRegexFeaturizer',
+    'FastPathLexicalSyntacticFeaturizer',
+    'FastPathCountVectorsFeaturizer',
+    'FastPathDIETClassifier',
+    'FastPathResponseSelector',
+    'ParseCacheLookup',
+    'ParseCacheWriter',
+    'HashingFeaturizer',
+    'GazetteerEntityExtractor'
+]
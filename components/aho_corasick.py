@@ -0,0 +1,100 @@
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """Character-level Aho-Corasick automaton for many fixed strings.
+
+    Matching is a single pass over the text, linear in its length plus the number of
+    matches, however many patterns there are. Patterns and text are compared
+    lowercased; ``find`` returns leftmost-longest, non-overlapping matches that sit
+    on word boundaries.
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns: List[str] = []
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        # Length of the longest pattern ending at each node and its pattern id
+        self.output: List[Tuple[int, int]] = [(0, -1)]
+        for pattern in patterns:
+            self._add(pattern)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _add(self, pattern: str) -> None:
+        key = pattern.lower().strip()
+        if not key:
+            return
+        node = 0
+        for char in key:
+            nxt = self.goto[node].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][char] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append((0, -1))
+            node = nxt
+        if self.output[node][1] < 0:
+            self.output[node] = (len(key), len(self.patterns))
+            self.patterns.append(pattern)
+
+    def _link(self) -> None:
+        # Children of the root fail back to the root (already 0)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(char, 0)
+                # Inherit the longest pattern reachable through the failure link
+                if self.output[child][1] < 0:
+                    self.output[child] = self.output[self.fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield ``(start, end, pattern_id)`` for every pattern occurrence ending at each position."""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # Offsets would not line up with the original text
+            lowered = "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+        node = 0
+        for i, char in enumerate(lowered):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            state = node
+            while state:
+                length, pattern_id = self.output[state]
+                if pattern_id < 0:
+                    break
+                yield i + 1 - length, i + 1, pattern_id
+                # Shorter patterns ending here are reachable via the failure chain
+                state = self.fail[state]
+                while state and (self.output[state][1] < 0 or self.output[state][0] >= length):
+                    state = self.fail[state]
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        """Leftmost-longest, non-overlapping matches on word boundaries."""
+        candidates = [
+            (start, end, pid)
+            for start, end, pid in self.iter_matches(text)
+            if _is_boundary(text, start - 1) and _is_boundary(text, end)
+        ]
+        candidates.sort(key=lambda m: (m[0], m[0] - m[1]))
+        matches = []
+        last_end = 0
+        for start, end, pid in candidates:
+            if start >= last_end:
+                matches.append((start, end, pid))
+                last_end = end
+        return matches
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    return index < 0 or index >= len(text) or not text[index].isalnum()
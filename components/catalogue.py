@@ -0,0 +1,29 @@
+import json
+from pathlib import Path
+from typing import Dict, Optional, Text
+
+
+def load_catalogue(orders_file: Optional[Text], products_file: Optional[Text]) -> Dict[Text, Text]:
+    """Map every surface form (name or synonym) to its canonical product name.
+
+    ``orders_file`` contributes the ``items`` of every order. ``products_file`` is
+    JSON: a list of names, or an object mapping each name to a list of synonyms.
+    """
+    surface: Dict[Text, Text] = {}
+    if orders_file and Path(orders_file).exists():
+        with open(orders_file, "r", encoding="utf-8") as f:
+            for order in json.load(f).values():
+                for item in order.get("items", []):
+                    surface.setdefault(item, item)
+    if products_file and Path(products_file).exists():
+        with open(products_file, "r", encoding="utf-8") as f:
+            products = json.load(f)
+        if isinstance(products, dict):
+            for name, synonyms in products.items():
+                surface[name] = name
+                for synonym in synonyms or []:
+                    surface[synonym] = name
+        else:
+            for name in products:
+                surface.setdefault(name, name)
+    return surface
@@ -0,0 +1,328 @@
+import json
+import logging
+import re
+import string
+import time
+from typing import Any, Dict, List, Optional, Text
+
+import numpy as np
+
+from rasa.engine.graph import ExecutionContext, GraphComponent
+from rasa.engine.recipes.default_recipe import DefaultV1Recipe
+from rasa.engine.storage.resource import Resource
+from rasa.engine.storage.storage import ModelStorage
+from rasa.nlu.classifiers.diet_classifier import DIETClassifier
+from rasa.nlu.featurizers.sparse_featurizer.count_vectors_featurizer import CountVectorsFeaturizer
+from rasa.nlu.featurizers.sparse_featurizer.lexical_syntactic_featurizer import LexicalSyntacticFeaturizer
+from rasa.nlu.featurizers.sparse_featurizer.regex_featurizer import RegexFeaturizer
+from rasa.nlu.selectors.response_selector import ResponseSelector
+from rasa.shared.nlu.constants import (
+    ENTITIES,
+    ENTITY_ATTRIBUTE_END,
+    ENTITY_ATTRIBUTE_START,
+    ENTITY_ATTRIBUTE_TYPE,
+    ENTITY_ATTRIBUTE_VALUE,
+    EXTRACTOR,
+    INTENT,
+    INTENT_NAME_KEY,
+    INTENT_RANKING_KEY,
+    PREDICTED_CONFIDENCE_KEY,
+    TEXT,
+)
+from rasa.shared.nlu.training_data.message import Message
+from rasa.shared.nlu.training_data.training_data import TrainingData
+from rasa.utils.tensorflow.constants import ENTITY_RECOGNITION, INTENT_CLASSIFICATION
+
+logger = logging.getLogger(__name__)
+
+FAST_PATH = "fast_path"
+# Internal flag: the message already has its final intent, e.g. from the fast path
+# or the parse cache, so expensive classifiers can leave it alone
+RESOLVED = "nlu_resolved"
+TABLE_FILE = "fast_path_table.json"
+_PUNCTUATION = re.compile(f"[{re.escape(string.punctuation)}]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(text: Text) -> Text:
+    """Lowercase, drop punctuation and collapse whitespace: "Hi there!" -> "hi there"."""
+    text = _PUNCTUATION.sub(" ", text.lower().replace("'", ""))
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class FastPathStats:
+    """Process-wide counters for the fast path, logged every ``log_every`` messages.
+
+    ``nlu_server.py`` serves ``as_dict()`` on ``GET /status``.
+    """
+
+    def __init__(self, log_every: int = 1000):
+        self.log_every = log_every
+        self.hits = 0
+        self.misses = 0
+        self.slow_seconds = 0.0
+        self.slow_messages = 0
+
+    def record_slow(self, seconds: float, messages: int) -> None:
+        self.slow_seconds += seconds
+        self.slow_messages += messages
+
+    def record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self.log_every and (self.hits + self.misses) % self.log_every == 0:
+            logger.info(f"NLU fast path: {self.as_dict()}")
+
+    def as_dict(self) -> Dict[Text, Any]:
+        total = self.hits + self.misses
+        per_message = self.slow_seconds / self.slow_messages if self.slow_messages else 0.0
+        return {
+            "messages": total,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "classifier_ms_per_message": round(per_message * 1000, 3),
+            # Every hit skipped one classifier pass
+            "estimated_ms_saved": round(self.hits * per_message * 1000, 1),
+        }
+
+
+stats = FastPathStats()
+
+
+@DefaultV1Recipe.register(
+    [DefaultV1Recipe.ComponentType.INTENT_CLASSIFIER], is_trainable=True
+)
+class FastPathRouter(GraphComponent):
+    """Classifies trivially recognisable messages before the neural pipeline.
+
+    Training examples are compiled into a table from normalized text to intent;
+    texts seen under more than one intent are left out. Bare order IDs are matched
+    with ``order_id_pattern``. Hits get the intent with confidence 1.0 and are
+    marked with ``fast_path``, so the ``FastPath*`` featurizers and classifiers after it
+    skip them. It only reads the text and entities, so put it before the featurizers.
+    """
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        return {
+            # Restrict the table to these intents (None means every intent)
+            "intents": None,
+            # A message that is only an order ID, optionally prefixed with '#'
+            "order_id_pattern": r"^\s*#?(\d{5})\s*$",
+            "order_id_intent": "provide_order_id",
+            "order_id_entity": "order_id",
+            "log_every": 1000,
+        }
+
+    def __init__(
+        self,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        table: Optional[Dict[Text, Text]] = None,
+    ) -> None:
+        self._config = config
+        self._model_storage = model_storage
+        self._resource = resource
+        self.table = table or {}
+        self.order_id_pattern = re.compile(config["order_id_pattern"])
+        stats.log_every = config["log_every"]
+
+    @classmethod
+    def create(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+    ) -> "FastPathRouter":
+        return cls(config, model_storage, resource)
+
+    @classmethod
+    def load(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+        **kwargs: Any,
+    ) -> "FastPathRouter":
+        try:
+            with model_storage.read_from(resource) as directory:
+                table = json.loads((directory / TABLE_FILE).read_text(encoding="utf-8"))
+        except (ValueError, FileNotFoundError):
+            logger.warning(f"No fast path table found for '{resource.name}'; every message takes the full pipeline.")
+            table = {}
+        return cls(config, model_storage, resource, table)
+
+    def train(self, training_data: TrainingData) -> Resource:
+        allowed = self._config["intents"]
+        seen: Dict[Text, set] = {}
+        for example in training_data.intent_examples:
+            intent = example.get(INTENT)
+            # Examples with entities need the extractors, so never short-circuit them
+            if example.get(ENTITIES) or (allowed and intent not in allowed):
+                continue
+            seen.setdefault(normalize(example.get(TEXT)), set()).add(intent)
+        self.table = {text: intents.pop() for text, intents in seen.items() if text and len(intents) == 1}
+
+        with self._model_storage.write_to(self._resource) as directory:
+            (directory / TABLE_FILE).write_text(json.dumps(self.table), encoding="utf-8")
+        return self._resource
+
+    def _route(self, message: Message) -> bool:
+        text = message.get(TEXT) or ""
+        intent = self.table.get(normalize(text))
+        entities = list(message.get(ENTITIES, []))
+        if intent is None:
+            match = self.order_id_pattern.match(text)
+            if not match:
+                return False
+            intent = self._config["order_id_intent"]
+            entity = self._config["order_id_entity"]
+            start, end = match.span(1)
+            # RegexEntityExtractor may already have found the same span
+            if not any(e.get(ENTITY_ATTRIBUTE_TYPE) == entity and e.get(ENTITY_ATTRIBUTE_START) == start for e in entities):
+                entities.append({
+                    ENTITY_ATTRIBUTE_TYPE: entity,
+                    ENTITY_ATTRIBUTE_VALUE: match.group(1),
+                    ENTITY_ATTRIBUTE_START: start,
+                    ENTITY_ATTRIBUTE_END: end,
+                    EXTRACTOR: self.__class__.__name__,
+                })
+
+        prediction = {INTENT_NAME_KEY: intent, PREDICTED_CONFIDENCE_KEY: 1.0}
+        message.set(INTENT, prediction, add_to_output=True)
+        message.set(INTENT_RANKING_KEY, [prediction], add_to_output=True)
+        message.set(ENTITIES, entities, add_to_output=True)
+        message.set(FAST_PATH, True, add_to_output=True)
+        message.set(RESOLVED, True)
+        return True
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        for message in messages:
+            if not message.get(RESOLVED):
+                stats.record(self._route(message))
+        return messages
+
+
+def unresolved(messages: List[Message]) -> List[Message]:
+    """Messages that still need the neural pipeline (no fast-path or parse-cache result)."""
+    return [m for m in messages if not m.get(RESOLVED)]
+
+
+@DefaultV1Recipe.register(
+    DefaultV1Recipe.ComponentType.MESSAGE_FEATURIZER, is_trainable=True
+)
+class FastPathRegexFeaturizer(RegexFeaturizer):
+    """``RegexFeaturizer`` that does not featurize already resolved messages."""
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        slow = unresolved(messages)
+        if slow:
+            super().process(slow)
+        return messages
+
+
+@DefaultV1Recipe.register(
+    DefaultV1Recipe.ComponentType.MESSAGE_FEATURIZER, is_trainable=True
+)
+class FastPathLexicalSyntacticFeaturizer(LexicalSyntacticFeaturizer):
+    """``LexicalSyntacticFeaturizer`` that does not featurize already resolved messages."""
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        slow = unresolved(messages)
+        if slow:
+            super().process(slow)
+        return messages
+
+
+@DefaultV1Recipe.register(
+    DefaultV1Recipe.ComponentType.MESSAGE_FEATURIZER, is_trainable=True
+)
+class FastPathCountVectorsFeaturizer(CountVectorsFeaturizer):
+    """``CountVectorsFeaturizer`` that does not featurize already resolved messages."""
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        slow = unresolved(messages)
+        if slow:
+            super().process(slow)
+        return messages
+
+
+@DefaultV1Recipe.register(
+    [
+        DefaultV1Recipe.ComponentType.INTENT_CLASSIFIER,
+        DefaultV1Recipe.ComponentType.ENTITY_EXTRACTOR,
+    ],
+    is_trainable=True,
+)
+class FastPathDIETClassifier(DIETClassifier):
+    """``DIETClassifier`` that leaves already resolved messages alone.
+
+    When several messages arrive together (see ``nlu_server.py``) they run through
+    TensorFlow as one batch instead of one inference call each.
+    """
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        return {**DIETClassifier.get_default_config(), "batch_inference": True}
+
+    def _predict_batch(self, messages: List[Message]) -> Optional[List[Dict[Text, Any]]]:
+        model_data = self._create_model_data(messages, training=False)
+        if model_data.is_empty() or model_data.number_of_examples() != len(messages):
+            return None
+        out = self.model.run_inference(model_data, batch_size=len(messages))
+        n = len(messages)
+        # Split the batch outputs back into one batch-of-one dict per message
+        return [
+            {
+                key: value[i:i + 1] if isinstance(value, np.ndarray) and value.ndim and value.shape[0] == n else value
+                for key, value in out.items()
+            }
+            for i in range(n)
+        ]
+
+    def _process_batch(self, messages: List[Message]) -> bool:
+        if (
+            len(messages) < 2
+            or not self.component_config["batch_inference"]
+            or self._execution_context.should_add_diagnostic_data
+            or self.model is None
+        ):
+            return False
+        outputs = self._predict_batch(messages)
+        if outputs is None:
+            return False
+        for message, out in zip(messages, outputs):
+            if self.component_config[INTENT_CLASSIFICATION]:
+                label, label_ranking = self._predict_label(out)
+                message.set(INTENT, label, add_to_output=True)
+                message.set(INTENT_RANKING_KEY, label_ranking, add_to_output=True)
+            if self.component_config[ENTITY_RECOGNITION]:
+                message.set(ENTITIES, self._predict_entities(out, message), add_to_output=True)
+        return True
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        slow = unresolved(messages)
+        if slow:
+            started = time.perf_counter()
+            if not self._process_batch(slow):
+                super().process(slow)
+            stats.record_slow(time.perf_counter() - started, len(slow))
+        return messages
+
+
+@DefaultV1Recipe.register(
+    [DefaultV1Recipe.ComponentType.INTENT_CLASSIFIER], is_trainable=True
+)
+class FastPathResponseSelector(ResponseSelector):
+    """``ResponseSelector`` that leaves already resolved messages alone."""
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        slow = unresolved(messages)
+        if slow:
+            super().process(slow)
+        return messages
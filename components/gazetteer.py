@@ -0,0 +1,80 @@
+import logging
+from typing import Any, Dict, List, Text
+
+from rasa.engine.graph import ExecutionContext, GraphComponent
+from rasa.engine.recipes.default_recipe import DefaultV1Recipe
+from rasa.engine.storage.resource import Resource
+from rasa.engine.storage.storage import ModelStorage
+from rasa.nlu.extractors.extractor import EntityExtractorMixin
+from rasa.shared.nlu.constants import (
+    ENTITIES,
+    ENTITY_ATTRIBUTE_CONFIDENCE,
+    ENTITY_ATTRIBUTE_END,
+    ENTITY_ATTRIBUTE_START,
+    ENTITY_ATTRIBUTE_TYPE,
+    ENTITY_ATTRIBUTE_VALUE,
+    TEXT,
+)
+from rasa.shared.nlu.training_data.message import Message
+
+from components.aho_corasick import AhoCorasick
+from components.catalogue import load_catalogue
+
+logger = logging.getLogger(__name__)
+
+
+@DefaultV1Recipe.register(
+    DefaultV1Recipe.ComponentType.ENTITY_EXTRACTOR, is_trainable=False
+)
+class GazetteerEntityExtractor(GraphComponent, EntityExtractorMixin):
+    """Extracts catalogue entries (``product_name`` by default) with an Aho-Corasick automaton.
+
+    Unlike lookup tables compiled into one alternation regex, matching cost does not
+    grow with the catalogue size. The catalogue is read from the order store and an
+    optional products file when the model is loaded, so new products need no retrain.
+    Synonyms are resolved to the canonical name directly.
+    """
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        return {
+            "entity": "product_name",
+            "orders_file": "dataset/orders.json",
+            "products_file": None,
+        }
+
+    def __init__(self, config: Dict[Text, Any]) -> None:
+        self.entity = config["entity"]
+        catalogue = load_catalogue(config["orders_file"], config["products_file"])
+        self.automaton = AhoCorasick(list(catalogue.keys()))
+        self.canonical = [catalogue[pattern] for pattern in self.automaton.patterns]
+        logger.debug(f"Gazetteer for '{self.entity}' built with {len(self.automaton)} surface forms.")
+
+    @classmethod
+    def create(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+    ) -> "GazetteerEntityExtractor":
+        return cls(config)
+
+    def _extract(self, text: Text) -> List[Dict[Text, Any]]:
+        return [
+            {
+                ENTITY_ATTRIBUTE_TYPE: self.entity,
+                ENTITY_ATTRIBUTE_VALUE: self.canonical[pattern_id],
+                ENTITY_ATTRIBUTE_START: start,
+                ENTITY_ATTRIBUTE_END: end,
+                ENTITY_ATTRIBUTE_CONFIDENCE: 1.0,
+            }
+            for start, end, pattern_id in self.automaton.find(text)
+        ]
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        for message in messages:
+            extracted = self.add_extractor_name(self._extract(message.get(TEXT) or ""))
+            if extracted:
+                message.set(ENTITIES, message.get(ENTITIES, []) + extracted, add_to_output=True)
+        return messages
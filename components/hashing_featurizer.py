@@ -0,0 +1,129 @@
+from typing import Any, Dict, List, Text, Type
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from rasa.engine.graph import ExecutionContext, GraphComponent
+from rasa.engine.recipes.default_recipe import DefaultV1Recipe
+from rasa.engine.storage.resource import Resource
+from rasa.engine.storage.storage import ModelStorage
+from rasa.nlu.constants import DENSE_FEATURIZABLE_ATTRIBUTES, MESSAGE_ATTRIBUTES, TOKENS_NAMES
+from rasa.nlu.featurizers.sparse_featurizer.sparse_featurizer import SparseFeaturizer
+from rasa.nlu.tokenizers.tokenizer import Tokenizer
+from rasa.shared.nlu.constants import ACTION_NAME, INTENT, INTENT_RESPONSE_KEY
+from rasa.shared.nlu.training_data.message import Message
+from rasa.shared.nlu.training_data.training_data import TrainingData
+
+from components.fast_path import unresolved
+
+# Featurized as whole labels, like CountVectorsFeaturizer does
+LABEL_ATTRIBUTES = [INTENT, ACTION_NAME, INTENT_RESPONSE_KEY]
+
+
+def _whole_label(label: Text) -> List[Text]:
+    return [label]
+
+
+@DefaultV1Recipe.register(
+    DefaultV1Recipe.ComponentType.MESSAGE_FEATURIZER, is_trainable=False
+)
+class HashingFeaturizer(SparseFeaturizer, GraphComponent):
+    """Bag of character n-grams hashed into a fixed number of columns.
+
+    Drop-in alternative to ``CountVectorsFeaturizer`` with ``analyzer: char_wb``:
+    there is no vocabulary, so the feature dimension (and DIET's input layer) stays
+    at ``n_features`` however much training data is added, and nothing needs to be
+    trained or persisted. Collisions are the price; 2^16 columns keep them rare for
+    the 1-4 gram range.
+
+    Attributes follow ``CountVectorsFeaturizer``: with ``analyzer: word`` the intent,
+    action name and response key labels are hashed too, each label into one column;
+    with character n-grams only text attributes are featurized and DIET falls back to
+    one-hot label encodings.
+    """
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        return {
+            **SparseFeaturizer.get_default_config(),
+            "analyzer": "char_wb",
+            "min_ngram": 1,
+            "max_ngram": 4,
+            "n_features": 2 ** 16,
+            "lowercase": True,
+        }
+
+    def __init__(self, config: Dict[Text, Any], execution_context: ExecutionContext) -> None:
+        super().__init__(execution_context.node_name, config)
+        self.vectorizer = HashingVectorizer(
+            analyzer=config["analyzer"],
+            ngram_range=(config["min_ngram"], config["max_ngram"]),
+            n_features=config["n_features"],
+            lowercase=config["lowercase"],
+            # Plain counts, like CountVectorsFeaturizer
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float32,
+        )
+        self.label_vectorizer = HashingVectorizer(
+            analyzer=_whole_label,
+            n_features=config["n_features"],
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float32,
+        )
+        self.attributes = MESSAGE_ATTRIBUTES if config["analyzer"] == "word" else DENSE_FEATURIZABLE_ATTRIBUTES
+
+    @classmethod
+    def create(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+    ) -> "HashingFeaturizer":
+        return cls(config, execution_context)
+
+    @classmethod
+    def validate_config(cls, config: Dict[Text, Any]) -> None:
+        if config["min_ngram"] > config["max_ngram"]:
+            raise ValueError("'min_ngram' must not be larger than 'max_ngram'.")
+        if config["n_features"] < 1:
+            raise ValueError("'n_features' must be positive.")
+
+    @classmethod
+    def validate_compatibility_with_tokenizer(
+        cls, config: Dict[Text, Any], tokenizer_type: Type[Tokenizer]
+    ) -> None:
+        pass
+
+    def _featurize(self, messages: List[Message], attribute: Text) -> None:
+        todo = [m for m in messages if m.get(TOKENS_NAMES[attribute])]
+        if not todo:
+            return
+        # One vectorizer call for every token and sentence of the batch
+        texts: List[Text] = []
+        spans = []
+        for message in todo:
+            tokens = [t.text for t in message.get(TOKENS_NAMES[attribute])]
+            spans.append((len(texts), len(tokens)))
+            texts.extend(tokens)
+            texts.append(message.get(attribute))
+        vectorizer = self.label_vectorizer if attribute in LABEL_ATTRIBUTES else self.vectorizer
+        matrix = vectorizer.transform(texts).tocsr()
+        for message, (start, count) in zip(todo, spans):
+            sequence = matrix[start:start + count].tocoo()
+            sentence = matrix[start + count:start + count + 1].tocoo()
+            self.add_features_to_message(sequence, sentence, attribute, message)
+
+    def process_training_data(self, training_data: TrainingData) -> TrainingData:
+        for attribute in self.attributes:
+            self._featurize(training_data.training_examples, attribute)
+        return training_data
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        # Fast-path and parse-cache hits skip the classifiers, so they need no features
+        slow = unresolved(messages)
+        for attribute in self.attributes:
+            self._featurize(slow, attribute)
+        return messages
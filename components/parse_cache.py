@@ -0,0 +1,201 @@
+import copy
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Text
+
+from rasa.engine.graph import ExecutionContext, GraphComponent
+from rasa.engine.recipes.default_recipe import DefaultV1Recipe
+from rasa.engine.storage.resource import Resource
+from rasa.engine.storage.storage import ModelStorage
+from rasa.shared.nlu.constants import (
+    ENTITIES,
+    TEXT,
+)
+from rasa.shared.nlu.training_data.message import Message
+
+from components.fast_path import RESOLVED
+
+logger = logging.getLogger(__name__)
+
+PARSE_CACHE = "parse_cache"
+_STARTED = "parse_cache_started"
+# Number of entities the extractors ahead of the lookup had already found
+_UPSTREAM = "parse_cache_upstream_entities"
+
+
+def cache_key(text: Text) -> Optional[Text]:
+    """The exact text; None for an empty message.
+
+    Neither casing nor spacing is normalised: LexicalSyntacticFeaturizer has casing
+    features, so "HELLO" may parse differently from "hello", and cached entity offsets
+    must line up with the text.
+    """
+    return text or None
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class ParseCache:
+    """LRU cache of parse results with TTL, bound to one model at a time."""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 3600.0, log_every: int = 1000):
+        self.enabled = True
+        self.max_size = max_size
+        self.ttl = ttl
+        self.log_every = log_every
+        self.model_id: Optional[Text] = None
+        self.entries: "OrderedDict[Text, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.hit_ms: deque = deque(maxlen=5000)
+        self.miss_ms: deque = deque(maxlen=5000)
+
+    def bind(self, model_id: Optional[Text]) -> None:
+        # A different model would parse differently, so start over on every swap
+        if model_id != self.model_id:
+            self.entries.clear()
+            self.model_id = model_id
+
+    def get(self, key: Text) -> Optional[Dict[Text, Any]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if self.ttl and time.monotonic() - stored_at > self.ttl:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return result
+
+    def put(self, key: Text, result: Dict[Text, Any]) -> None:
+        self.entries[key] = (time.monotonic(), result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def record(self, hit: bool, elapsed_ms: float) -> None:
+        if hit:
+            self.hits += 1
+            self.hit_ms.append(elapsed_ms)
+        else:
+            self.misses += 1
+            self.miss_ms.append(elapsed_ms)
+        if self.log_every and (self.hits + self.misses) % self.log_every == 0:
+            logger.info(f"NLU parse cache: {self.as_dict()}")
+
+    def as_dict(self) -> Dict[Text, Any]:
+        total = self.hits + self.misses
+        every = list(self.hit_ms) + list(self.miss_ms)
+        return {
+            "messages": total,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "size": len(self.entries),
+            "p99_ms": round(_percentile(every, 0.99), 3),
+            "hit_p99_ms": round(_percentile(list(self.hit_ms), 0.99), 3),
+            "miss_p99_ms": round(_percentile(list(self.miss_ms), 0.99), 3),
+        }
+
+
+cache = ParseCache()
+
+
+def _restore(message: Message, result: Dict[Text, Any]) -> None:
+    for key, value in copy.deepcopy(result).items():
+        if key == ENTITIES:
+            # Only entities found after the lookup are cached; the extractors ahead of
+            # it have already run on this text
+            value = message.get(ENTITIES, []) + value
+        message.set(key, value, add_to_output=True)
+
+
+@DefaultV1Recipe.register(
+    [DefaultV1Recipe.ComponentType.INTENT_CLASSIFIER], is_trainable=False
+)
+class ParseCacheLookup(GraphComponent):
+    """Restores cached parse results before the expensive components run.
+
+    Put it right after the rule-based entity extractors (which are cheap) and before
+    the featurizers, and ``ParseCacheWriter`` right before ``FallbackClassifier``. Only
+    what the components in between produce is cached: intent, ranking, responses and
+    the entities they add. Hits are flagged ``parse_cache: hit`` and skipped by the
+    ``FastPath*`` featurizers and classifiers. With
+    ``enabled: false`` nothing is cached but latency is still recorded, for comparison.
+    """
+
+    @staticmethod
+    def get_default_config() -> Dict[Text, Any]:
+        return {
+            "enabled": True,
+            "max_size": 10000,
+            # Seconds; 0 disables expiry
+            "ttl": 3600,
+            "log_every": 1000,
+        }
+
+    def __init__(self, config: Dict[Text, Any]) -> None:
+        cache.enabled = bool(config["enabled"])
+        cache.max_size = int(config["max_size"])
+        cache.ttl = float(config["ttl"])
+        cache.log_every = int(config["log_every"])
+
+    @classmethod
+    def create(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+    ) -> "ParseCacheLookup":
+        cache.bind(execution_context.model_id)
+        return cls(config)
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        for message in messages:
+            message.set(_STARTED, time.perf_counter())
+            message.set(_UPSTREAM, len(message.get(ENTITIES, [])))
+            key = cache_key(message.get(TEXT)) if cache.enabled else None
+            result = cache.get(key) if key else None
+            if result is None:
+                continue
+            _restore(message, result)
+            message.set(RESOLVED, True)
+            message.set(PARSE_CACHE, "hit", add_to_output=True)
+        return messages
+
+
+@DefaultV1Recipe.register(
+    [DefaultV1Recipe.ComponentType.INTENT_CLASSIFIER], is_trainable=False
+)
+class ParseCacheWriter(GraphComponent):
+    """Stores fresh parse results for ``ParseCacheLookup`` and records parse latency."""
+
+    @classmethod
+    def create(
+        cls,
+        config: Dict[Text, Any],
+        model_storage: ModelStorage,
+        resource: Resource,
+        execution_context: ExecutionContext,
+    ) -> "ParseCacheWriter":
+        return cls()
+
+    def process(self, messages: List[Message]) -> List[Message]:
+        for message in messages:
+            started = message.get(_STARTED)
+            hit = message.get(PARSE_CACHE) == "hit"
+            key = cache_key(message.get(TEXT)) if cache.enabled and not hit else None
+            if key:
+                result = {
+                    k: copy.deepcopy(v)
+                    for k, v in message.data.items()
+                    if k in message.output_properties and k not in (TEXT, ENTITIES)
+                }
+                result[ENTITIES] = copy.deepcopy(message.get(ENTITIES, [])[message.get(_UPSTREAM) or 0:])
+                cache.put(key, result)
+            if started is not None:
+                cache.record(hit, (time.perf_counter() - started) * 1000)
+        return messages
@@ -210,6 +210,22 @@ class BitextProcessor:
             yaml.dump(transformed, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
         print("NLU data saved successfully!")
     
+    def create_faq_pairs(self):
+        """Utterance/response pairs for the runtime FAQ index (actions/faq_index.py)."""
+        pairs = []
+        response_col = 'response' if 'response' in self.df.columns else 'response_text'
+        utterance_col = 'utterance' if 'utterance' in self.df.columns else 'instruction'
+        if response_col not in self.df.columns:
+            return pairs
+        seen = set()
+        for _, row in self.df.iterrows():
+            utterance = str(row[utterance_col]).strip()
+            response_text = str(row[response_col]).strip()
+            if utterance and response_text and (utterance, response_text) not in seen:
+                seen.add((utterance, response_text))
+                pairs.append({'utterance': utterance, 'response': response_text})
+        return pairs
+
     def save_responses(self, output_path, responses):
         print(f"\nSaving responses to {output_path}...")
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -236,6 +252,7 @@ def main():
     
     processor.save_nlu_data('data/nlu_from_bitext.yml', nlu_data)
     processor.save_responses('dataset/bitext_responses.json', responses)
+    processor.save_responses('dataset/bitext_faq.json', processor.create_faq_pairs())
     
     print("\n" + "="*50)
     print("Dataset processing complete!")
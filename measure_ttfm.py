@@ -0,0 +1,94 @@
+"""Compare time-to-first-message of the blocking REST webhook and the streaming SSE channel.
+
+Usage: python measure_ttfm.py [--base http://localhost:5006] [--rounds 5]
+"""
+import argparse
+import json
+import statistics
+import time
+from uuid import uuid4
+
+import requests
+
+
+# Multi-message turns benefit most from streaming (form prompt after a custom action)
+CONVERSATION = [
+    "hello",
+    "where is my order",
+    "12345",
+    "I want to return an item",
+    "12345",
+    "it arrived damaged",
+]
+
+
+def rest_turn(session: requests.Session, base: str, sender: str, text: str):
+    started = time.perf_counter()
+    resp = session.post(f"{base}/webhooks/rest/webhook", json={"sender": sender, "message": text}, timeout=(3.05, 30))
+    resp.raise_for_status()
+    resp.json()
+    # Every reply arrives together, so first message == total
+    elapsed = time.perf_counter() - started
+    return elapsed, elapsed
+
+
+def sse_turn(session: requests.Session, base: str, sender: str, text: str):
+    started = time.perf_counter()
+    first = None
+    resp = session.post(f"{base}/webhooks/sse/webhook", json={"sender": sender, "message": text}, timeout=(3.05, 30), stream=True)
+    resp.raise_for_status()
+    event = "message"
+    for line in resp.iter_lines(decode_unicode=True):
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:") and event == "message" and first is None:
+            first = time.perf_counter() - started
+        elif line.startswith("data:") and event == "done":
+            break
+    total = time.perf_counter() - started
+    return (first if first is not None else total), total
+
+
+def measure(session: requests.Session, base: str, turn, rounds: int):
+    firsts, totals = [], []
+    for _ in range(rounds):
+        sender = f"ttfm-{uuid4().hex[:8]}"
+        for text in CONVERSATION:
+            first, total = turn(session, base, sender, text)
+            firsts.append(first * 1000)
+            totals.append(total * 1000)
+    return firsts, totals
+
+
+def p95(values):
+    ordered = sorted(values)
+    return ordered[max(0, int(round(0.95 * len(ordered))) - 1)]
+
+
+def summarize(name: str, firsts, totals):
+    return {
+        "channel": name,
+        "turns": len(firsts),
+        "first_message_p50_ms": round(statistics.median(firsts), 1),
+        "first_message_p95_ms": round(p95(firsts), 1),
+        "total_p50_ms": round(statistics.median(totals), 1),
+        "total_p95_ms": round(p95(totals), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base", default="http://localhost:5006")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    session = requests.Session()
+    results = [
+        summarize("rest", *measure(session, args.base, rest_turn, args.rounds)),
+        summarize("sse", *measure(session, args.base, sse_turn, args.rounds)),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Micro-batching NLU server.
+
+Serves ``POST /model/parse`` (the same contract as ``rasa run --enable-api``) from a
+model loaded in this process. Requests that arrive within ``--window-ms`` of each other,
+up to ``--max-batch``, are parsed in one pass through the NLU graph, so featurizers and
+FastPathDIETClassifier run on the whole batch; each caller gets its own result back.
+
+``GET /status`` reports the batching counters together with the fast-path hit rate and
+estimated time saved, and the parse-cache hit ratio and latency.
+
+Point core at it in endpoints.yml:
+  nlu:
+    url: "http://localhost:5007"
+
+Usage: python nlu_server.py [--model models/production.tar.gz] [--port 5007]
+                            [--window-ms 5] [--max-batch 32]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Text, Tuple
+
+from aiohttp import web
+
+from rasa.core.agent import Agent
+from rasa.core.channels.channel import UserMessage
+from rasa.engine.constants import PLACEHOLDER_MESSAGE, PLACEHOLDER_TRACKER
+from rasa.shared.nlu.constants import ENTITIES, INTENT, INTENT_NAME_KEY, PREDICTED_CONFIDENCE_KEY, TEXT
+
+from components import fast_path, parse_cache
+from run_all import MODELS_DIR, latest_model_tar
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Collects concurrent parse requests and runs them through the NLU graph together."""
+
+    def __init__(self, agent: Agent, window_ms: float = 5.0, max_batch: int = 32):
+        self.agent = agent
+        self.window = window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.queue: "asyncio.Queue[Tuple[Text, asyncio.Future]]" = asyncio.Queue()
+        # One inference at a time: TensorFlow is not re-entered concurrently
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batches = 0
+        self.messages = 0
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._worker is None:
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self.executor.shutdown(wait=False)
+
+    async def parse(self, text: Text) -> Dict[Text, Any]:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[Text, asyncio.Future]]:
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        # Anything already queued joins without waiting
+        while len(batch) < self.max_batch and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            texts = [text for text, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self._parse_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.messages += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _parse_batch(self, texts: List[Text]) -> List[Dict[Text, Any]]:
+        processor = self.agent.processor
+        messages = [UserMessage(text) for text in texts]
+        results = processor.graph_runner.run(
+            inputs={PLACEHOLDER_MESSAGE: messages, PLACEHOLDER_TRACKER: None},
+            targets=[processor.model_metadata.nlu_target],
+        )
+        parsed = []
+        for message in results[processor.model_metadata.nlu_target]:
+            # Same defaults as MessageProcessor for messages the pipeline left empty
+            data = {TEXT: "", INTENT: {INTENT_NAME_KEY: None, PREDICTED_CONFIDENCE_KEY: 0.0}, ENTITIES: []}
+            data.update(message.as_dict(only_output_properties=True))
+            parsed.append(data)
+        return parsed
+
+    def stats(self) -> Dict[Text, Any]:
+        return {
+            "batches": self.batches,
+            "messages": self.messages,
+            "mean_batch_size": round(self.messages / self.batches, 2) if self.batches else 0.0,
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+        }
+
+
+def create_app(model_path: Text, window_ms: float, max_batch: int) -> web.Application:
+    app = web.Application()
+
+    async def on_startup(app: web.Application) -> None:
+        agent = Agent.load(model_path)
+        app["batcher"] = MicroBatcher(agent, window_ms, max_batch)
+        app["batcher"].start()
+
+    async def on_cleanup(app: web.Application) -> None:
+        await app["batcher"].stop()
+
+    async def parse(request: web.Request) -> web.Response:
+        payload = await request.json()
+        text = payload.get("text") or payload.get("q") or ""
+        return web.json_response(await request.app["batcher"].parse(text))
+
+    async def status(request: web.Request) -> web.Response:
+        return web.json_response({
+            "model_file": model_path,
+            **request.app["batcher"].stats(),
+            "fast_path": fast_path.stats.as_dict(),
+            "parse_cache": parse_cache.cache.as_dict(),
+        })
+
+    app.router.add_post("/model/parse", parse)
+    app.router.add_get("/status", status)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve /model/parse with micro-batched NLU inference.")
+    default_model = MODELS_DIR / "production.tar.gz"
+    parser.add_argument("--model", default=str(default_model if default_model.exists() else latest_model_tar()))
+    parser.add_argument("--port", type=int, default=5007)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=32)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    web.run_app(create_app(args.model, args.window_ms, args.max_batch), port=args.port)
+
+
+if __name__ == "__main__":
+    main()
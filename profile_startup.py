@@ -0,0 +1,136 @@
+"""Profile action server startup: import time, deferred init time and time-to-healthy.
+
+1. imports         ``python -X importtime`` over rasa-sdk's ``create_app("actions")``,
+                   which imports every module of the actions package, summed per
+                   top-level package
+2. init            a fresh process builds the app and runs ``warm_up()``, timing each
+                   deferred part (dotenv, order file, FAQ index, ticket store)
+3. time-to-healthy starts ``action_server.py`` --runs times and polls /health every 20 ms
+
+Exits non-zero when the median time-to-healthy misses --target (seconds) or building the
+app already imports numpy or openpyxl, so it can gate changes that slow startup down.
+Measured with --runs 5 on the dev box (Python 3.10, rasa-sdk 3.6.2), medians of
+time-to-healthy and create_app import time:
+  before deferred init          0.85 s  705 ms (openpyxl 202, numpy 84, setuptools 60)
+  deferred, numpy still eager   0.60 s  436 ms (numpy 72, setuptools 57, sanic 36)
+  deferred init                 0.50 s  377 ms (setuptools 59, sanic 38, ruamel 17)
+  rasa run actions              1.70 s
+The default target of 0.7 s fails a return to eager init and leaves room for noise
+(samples spread about 0.1 s); the eager-import check catches numpy alone, which costs
+less than that. Scale the target by the same ratio on slower machines.
+
+Usage: python profile_startup.py [--runs 3] [--target 0.7] [--port 5056] [--top 15]
+                                 [--baseline]   # also time plain `rasa run actions`
+"""
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+
+
+ROOT = Path(__file__).parent.resolve()
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+CREATE_APP = "from rasa_sdk.endpoint import create_app; create_app('actions')"
+# Must not be imported before the first request needs them
+DEFERRED = ("numpy", "openpyxl")
+
+
+def import_breakdown(top: int) -> Dict[str, float]:
+    """Own import time in ms per top-level package while rasa-sdk builds the app, slowest first.
+
+    ``create_app`` imports every module of the actions package, so this is what the
+    server pays before /health answers, not just ``import actions``.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CREATE_APP],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"Creating the action server app failed:\n{proc.stderr[-2000:]}")
+    rows = [m.groups() for m in map(IMPORT_LINE.match, proc.stderr.splitlines()) if m]
+    per_package: Dict[str, float] = defaultdict(float)
+    for own_us, _, _, module in rows:
+        per_package[module.split(".")[0]] += int(own_us) / 1000
+    ordered = sorted(per_package.items(), key=lambda item: item[1], reverse=True)
+    return {"total_ms": round(sum(per_package.values()), 1), **{k: round(v, 1) for k, v in ordered[:top]}}
+
+
+def init_breakdown() -> Dict[str, float]:
+    script = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        f"{CREATE_APP}\n"
+        "created = time.perf_counter()\n"
+        "from actions.actions import warm_up\n"
+        f"eager = [m for m in {DEFERRED!r} if m in sys.modules]\n"
+        "print(json.dumps({'create_app_ms': round((created - started) * 1000, 2),\n"
+        "                  'eager_imports': eager, **warm_up()}))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(f"Initializing actions failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def time_to_healthy(command: List[str], port: int, timeout: float = 60.0) -> float:
+    started = time.perf_counter()
+    proc = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise SystemExit(f"{' '.join(command)} exited with {proc.returncode}")
+            try:
+                if requests.get(f"http://localhost:{port}/health", timeout=0.5).ok:
+                    return time.perf_counter() - started
+            except requests.RequestException:
+                pass
+            time.sleep(0.02)
+        return float("inf")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile action server startup.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--target", type=float, default=0.7, help="Median time-to-healthy budget in seconds")
+    parser.add_argument("--port", type=int, default=5056)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--baseline", action="store_true", help="Also measure `rasa run actions`")
+    args = parser.parse_args()
+
+    report = {"imports_ms": import_breakdown(args.top), "init_ms": init_breakdown()}
+
+    commands = {"action_server.py": [sys.executable, "action_server.py", "--port", str(args.port)]}
+    if args.baseline:
+        commands["rasa run actions"] = [sys.executable, "-m", "rasa", "run", "actions", "-p", str(args.port)]
+    report["time_to_healthy_s"] = {}
+    for label, command in commands.items():
+        samples = [time_to_healthy(command, args.port) for _ in range(args.runs)]
+        report["time_to_healthy_s"][label] = {
+            "median": round(statistics.median(samples), 2),
+            "samples": [round(s, 2) for s in samples],
+        }
+
+    median = report["time_to_healthy_s"]["action_server.py"]["median"]
+    report["target_s"] = args.target
+    report["within_target"] = median <= args.target
+    print(json.dumps(report, indent=2))
+    if not report["within_target"] or report["init_ms"]["eager_imports"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
 import os
+import re
+import json
+import hashlib
 import sys
 import time
 import signal
 import webbrowser
+import statistics
 import subprocess
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
+from uuid import uuid4
 
 import requests
+import yaml
 
 
 ROOT = Path(__file__).parent.resolve()
@@ -20,23 +26,119 @@ def latest_model_tar() -> Optional[Path]:
     return candidates[0] if candidates else None
 
 
-def ensure_model() -> Path:
+MANIFEST = MODELS_DIR / "production.manifest.json"
+TRAIN_CONFIG = MODELS_DIR / "config.train.yml"
+TRAINING_REPORT = MODELS_DIR / "training_report.jsonl"
+# Trainable components that support validation checkpointing
+VALIDATED_COMPONENTS = {"DIETClassifier", "ResponseSelector", "TEDPolicy"}
+
+
+def training_inputs() -> Dict[str, str]:
+    """Hash the training inputs, grouped by the part of the model they affect."""
+    groups = {name: hashlib.sha256() for name in ("nlu", "core", "domain", "config")}
+    for path in sorted((ROOT / "data").rglob("*.yml")):
+        content = path.read_bytes()
+        keys = set((yaml.safe_load(content) or {}).keys())
+        group = "nlu" if "nlu" in keys else "core"
+        groups[group].update(path.name.encode() + content)
+    groups["domain"].update((ROOT / "domain.yml").read_bytes())
+    groups["config"].update((ROOT / "config.yml").read_bytes())
+    groups["config"].update(os.getenv("RASA_VALIDATION_EXAMPLES", "0").encode())
+    return {name: h.hexdigest() for name, h in groups.items()}
+
+
+def write_training_config() -> Path:
+    """Derive the config used for training from config.yml.
+
+    With RASA_VALIDATION_EXAMPLES=N, N examples are held out and the neural components
+    keep the checkpoint with the best validation score (Rasa's form of early stopping).
+    Full retrains and fine-tunes use the same derived file, as fine-tuning requires.
+    """
+    config = yaml.safe_load((ROOT / "config.yml").read_text(encoding="utf-8"))
+    holdout = int(os.getenv("RASA_VALIDATION_EXAMPLES", "0"))
+    if holdout > 0:
+        for component in config.get("pipeline", []) + config.get("policies", []):
+            if any(component.get("name", "").endswith(name) for name in VALIDATED_COMPONENTS):
+                component.setdefault("evaluate_on_number_of_examples", holdout)
+                component.setdefault("evaluate_every_number_of_epochs", 5)
+                component.setdefault("checkpoint_model", True)
+    TRAIN_CONFIG.write_text(yaml.safe_dump(config, sort_keys=False), encoding="utf-8")
+    return TRAIN_CONFIG
+
+
+def run_training(args: List[str]) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "rasa", "train", "--config", str(write_training_config()), *args], cwd=ROOT, check=True)
+    return time.perf_counter() - started
+
+
+def train_model(prod: Path, changed: List[str], mode: str, manifest: Dict) -> None:
+    """Train a new model, fine-tuning from production when only data changed."""
+    report = {"changed": changed, "mode": "full"}
+    # Fine-tuning needs the same config and label set, so config/domain changes retrain fully
+    can_finetune = mode == "incremental" and prod.exists() and not {"config", "domain"} & set(changed)
+    seconds = None
+    if can_finetune:
+        fraction = os.getenv("RASA_FINETUNE_EPOCH_FRACTION", "0.2")
+        print(f"[orchestrator] Changed: {', '.join(changed)}. Fine-tuning from {prod.name} ({fraction} of epochs)...")
+        try:
+            # Rasa's training cache also reuses every component whose inputs did not change
+            seconds = run_training(["--finetune", str(prod), "--epoch-fraction", fraction])
+            report["mode"] = "finetune"
+        except subprocess.CalledProcessError:
+            print("[orchestrator] Fine-tuning failed. Falling back to a full retrain...")
+    if seconds is None:
+        print(f"[orchestrator] Changed: {', '.join(changed) or 'no model'}. Training a model...")
+        seconds = run_training([])
+        manifest["full_train_seconds"] = seconds
+
+    report["seconds"] = round(seconds, 1)
+    full = manifest.get("full_train_seconds")
+    if report["mode"] == "finetune" and full:
+        report["full_train_seconds"] = round(full, 1)
+        print(f"[orchestrator] Fine-tune took {seconds:.0f}s vs {full:.0f}s for the last full retrain "
+              f"({100 * (1 - seconds / full):.0f}% saved).")
+    else:
+        print(f"[orchestrator] Training took {seconds:.0f}s.")
+    with open(TRAINING_REPORT, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"), **report}) + "\n")
+
+
+def ensure_model(mode: Optional[str] = None) -> Path:
     """Ensure a usable model exists and prefer production.tar.gz synchronized with latest.
 
     - If no models exist, train one.
+    - If NLU data, stories/rules, domain or config changed since production was trained,
+      retrain: by default (RASA_TRAIN_MODE=incremental) fine-tune from production when only
+      training data changed; RASA_TRAIN_MODE=full always retrains from scratch, off never does.
     - If production.tar.gz exists but is older than latest model, update production from latest.
     - Return production.tar.gz if present; otherwise return the latest model.
     """
+    mode = mode or os.getenv("RASA_TRAIN_MODE", "incremental")
     MODELS_DIR.mkdir(parents=True, exist_ok=True)
     prod = MODELS_DIR / "production.tar.gz"
     latest = latest_model_tar()
+    inputs = training_inputs()
+    manifest = json.loads(MANIFEST.read_text(encoding="utf-8")) if MANIFEST.exists() else {}
+    in_sync = True
 
     if latest is None:
         print("[orchestrator] No model found. Training a model...")
-        subprocess.run([sys.executable, "-m", "rasa", "train"], cwd=ROOT, check=True)
+        train_model(prod, [], "full", manifest)
         latest = latest_model_tar()
         if latest is None:
             raise RuntimeError("Model training completed but no model file was found in models/.")
+    elif not manifest.get("inputs"):
+        # Existing model of unknown provenance: assume it matches the current data
+        pass
+    else:
+        changed = [name for name, digest in inputs.items() if manifest["inputs"].get(name) != digest]
+        if changed and mode == "off":
+            print(f"[orchestrator] Warning: {', '.join(changed)} changed but RASA_TRAIN_MODE=off; using the existing model.")
+            in_sync = False
+        elif changed:
+            train_model(latest if not prod.exists() else prod, changed, mode, manifest)
+            latest = latest_model_tar()
 
     # Sync production with latest if missing or outdated
     try:
@@ -46,10 +148,13 @@ def ensure_model() -> Path:
         # If copying fails, fall back to latest
         pass
 
+    if in_sync:
+        manifest["inputs"] = inputs
+    MANIFEST.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
     return prod if prod.exists() else latest
 
 
-def wait_for_url(url: str, timeout_sec: int = 30) -> bool:
+def wait_for_url(url: str, timeout_sec: int = 30, interval_sec: float = 0.8) -> bool:
     deadline = time.time() + timeout_sec
     while time.time() < deadline:
         try:
@@ -58,7 +163,7 @@ def wait_for_url(url: str, timeout_sec: int = 30) -> bool:
                 return True
         except Exception:
             pass
-        time.sleep(0.8)
+        time.sleep(interval_sec)
     return False
 
 
@@ -73,30 +178,121 @@ def is_url_ok(url: str, timeout_sec: float = 3.0) -> bool:
 def start_actions_server(port: int = 5055) -> subprocess.Popen:
     print(f"[orchestrator] Starting actions server on port {port}...")
     proc = subprocess.Popen(
-        [sys.executable, "-m", "rasa", "run", "actions", "-p", str(port)],
+        # rasa run actions plus /metrics (per-action phase timings)
+        [sys.executable, "action_server.py", "--port", str(port)],
         cwd=ROOT,
     )
-    ok = wait_for_url(f"http://localhost:{port}/health", timeout_sec=40)
+    started = time.time()
+    ok = wait_for_url(f"http://localhost:{port}/health", timeout_sec=40, interval_sec=0.1)
     if ok:
-        print("[orchestrator] Actions server is healthy.")
+        # profile_startup.py breaks this down and checks it against a target
+        print(f"[orchestrator] Actions server is healthy ({time.time() - started:.1f}s).")
     else:
         print("[orchestrator] Warning: actions server health check timed out.")
     return proc
 
 
+def warmup_utterances(per_intent: int = 2) -> List[str]:
+    """A few examples per intent from data/nlu.yml plus the user turns of tests/test_stories.yml."""
+    texts: List[str] = []
+    try:
+        nlu = yaml.safe_load((ROOT / "data" / "nlu.yml").read_text(encoding="utf-8")) or {}
+        for item in nlu.get("nlu", []):
+            if not item.get("intent"):
+                continue
+            examples = [
+                line.strip()[2:] for line in str(item.get("examples", "")).splitlines()
+                if line.strip().startswith("- ")
+            ]
+            texts.extend(examples[:per_intent])
+        stories = yaml.safe_load((ROOT / "tests" / "test_stories.yml").read_text(encoding="utf-8")) or {}
+        for story in stories.get("stories", []):
+            for step in story.get("steps", []):
+                if step.get("user"):
+                    texts.append(str(step["user"]).strip())
+    except Exception as e:
+        print(f"[orchestrator] Warning: could not read warm-up utterances: {e}")
+    # Strip entity markup like [12345](order_id)
+    return [re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", t) for t in texts if t]
+
+
+def perturb(texts: List[str]) -> List[str]:
+    """Variants no earlier request has seen: each gets a filler word and a one-off token,
+    so it misses both the fast-path table and the parse cache and goes through DIET."""
+    fillers = ["please", "now", "today", "again", "thanks", "asap"]
+    return [f"{text} {fillers[i % len(fillers)]} ref{uuid4().hex[:6]}" for i, text in enumerate(texts)]
+
+
+def warm_up_core(port: int = 5006) -> None:
+    """Replay representative traffic so TensorFlow tracing happens before real users arrive."""
+    base = f"http://localhost:{port}"
+    texts = warmup_utterances()
+    if not texts:
+        return
+    session = requests.Session()
+
+    def parse_ms(text: str) -> Optional[float]:
+        started = time.perf_counter()
+        try:
+            session.post(f"{base}/model/parse", json={"text": text}, timeout=60).raise_for_status()
+        except Exception:
+            return None
+        return (time.perf_counter() - started) * 1000
+
+    print(f"[orchestrator] Warming up core with {len(texts)} utterances...")
+    # Both passes use fresh variants: re-parsing the cold texts would only time cache hits
+    cold = [ms for ms in map(parse_ms, perturb(texts)) if ms is not None]
+    warm = [ms for ms in map(parse_ms, perturb(texts)) if ms is not None]
+
+    # Policies are warmed up on an in-request tracker through /model/predict: nothing
+    # reaches the tracker store, the event broker (analytics) or the ticket actions
+    events: List[dict] = [
+        {"event": "action", "name": "action_session_start"},
+        {"event": "session_started"},
+        {"event": "action", "name": "action_listen"},
+    ]
+    conversation_ms = []
+    for text in perturb(["hello", "where is my order"]) + ["12345"]:
+        started = time.perf_counter()
+        try:
+            parsed = session.post(f"{base}/model/parse", json={"text": text}, timeout=60)
+            parsed.raise_for_status()
+            events.append({"event": "user", "text": text, "parse_data": parsed.json()})
+            session.post(f"{base}/model/predict", json=events, timeout=60).raise_for_status()
+            conversation_ms.append((time.perf_counter() - started) * 1000)
+        except Exception:
+            break
+        events.append({"event": "action", "name": "action_listen"})
+
+    if cold and warm:
+        print(
+            f"[orchestrator] Warm-up done: first parse {cold[0]:.0f} ms, "
+            f"cold median {statistics.median(cold):.0f} ms -> warm median {statistics.median(warm):.0f} ms "
+            f"(delta {statistics.median(cold) - statistics.median(warm):.0f} ms)."
+        )
+    else:
+        print("[orchestrator] Warning: warm-up parses failed; first replies may be slow.")
+    if conversation_ms:
+        print(f"[orchestrator] Warm-up dialogue turns: {', '.join(f'{ms:.0f} ms' for ms in conversation_ms)}.")
+
+
 def start_core_server(model_path: Path, port: int = 5006) -> subprocess.Popen:
     print(f"[orchestrator] Starting core server on port {port} with model {model_path.name}...")
     proc = subprocess.Popen(
         [
             sys.executable, "-m", "rasa", "run",
             "--enable-api", "-p", str(port), "--cors", "*",
-            "--connector", "rest", "-m", str(model_path),
+            # credentials.yml enables both the REST and the streaming SSE channel
+            "--credentials", "credentials.yml", "-m", str(model_path),
         ],
         cwd=ROOT,
     )
     ok = wait_for_url(f"http://localhost:{port}/status", timeout_sec=60)
     if ok:
         print("[orchestrator] Core server is reachable.")
+        # Only report ready once first-call costs have been paid
+        warm_up_core(port)
+        print("[orchestrator] Core server is ready.")
     else:
         print("[orchestrator] Warning: core server status check timed out.")
     return proc
@@ -129,6 +325,9 @@ def start_streamlit(port: int = 8501) -> subprocess.Popen:
 
 
 def main():
+    if "--train-only" in sys.argv:
+        ensure_model()
+        return
     try:
         model_path = ensure_model()
         actions_proc = start_actions_server(port=5055)
@@ -138,7 +337,8 @@ def main():
         print("\n[orchestrator] All services started.")
         print("[orchestrator] UI: http://localhost:8501/ (or :8502 if 8501 was busy)")
         print("[orchestrator] Core: http://localhost:5006/status")
-        print("[orchestrator] Actions: http://localhost:5055/health\n")
+        print("[orchestrator] Actions: http://localhost:5055/health")
+        print("[orchestrator] Action metrics: http://localhost:5055/metrics\n")
 
         # Keep the orchestrator running until user interrupts
         unhealthy_streak = 0
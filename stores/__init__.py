@@ -0,0 +1,7 @@
+from stores.tracker_store import CompactingSQLTrackerStore
+from stores.lock_store import SQLiteLockStore
+
+__all__ = [
+    'CompactingSQLTrackerStore',
+    'SQLiteLockStore'
+]
@@ -0,0 +1,108 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, Text
+
+from rasa.core.lock import TicketLock
+from rasa.core.lock_store import LOCK_LIFETIME, LockStore
+from rasa.utils.endpoints import EndpointConfig
+
+
+class SQLiteLockStore(LockStore):
+    """Conversation lock store shared by every core process on a host.
+
+    A drop-in stand-in for ``RedisLockStore``: locks live in a SQLite file (WAL mode)
+    and every read-modify-write of a conversation's ticket queue runs in one
+    ``BEGIN IMMEDIATE`` transaction, so two replicas can never hand out the same
+    ticket. Messages for one sender are served strictly in ticket order while
+    other senders' locks are independent rows and proceed in parallel.
+    """
+
+    def __init__(
+        self,
+        endpoint_config: Optional[EndpointConfig] = None,
+        db: Text = "rasa_locks.db",
+        timeout: float = 10.0,
+    ) -> None:
+        if endpoint_config is not None:
+            db = endpoint_config.kwargs.get("db", db)
+            timeout = float(endpoint_config.kwargs.get("timeout", timeout))
+        self.db = db
+        self._mutex = threading.Lock()
+        self._conn = sqlite3.connect(db, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS locks (conversation_id TEXT PRIMARY KEY, lock TEXT NOT NULL)"
+        )
+        super().__init__()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._mutex:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _read(conn: sqlite3.Connection, conversation_id: Text) -> Optional[TicketLock]:
+        row = conn.execute("SELECT lock FROM locks WHERE conversation_id = ?", (conversation_id,)).fetchone()
+        return TicketLock.from_dict(json.loads(row[0])) if row else None
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, lock: TicketLock) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO locks (conversation_id, lock) VALUES (?, ?)",
+            (lock.conversation_id, lock.dumps()),
+        )
+
+    def get_lock(self, conversation_id: Text) -> Optional[TicketLock]:
+        with self._mutex:
+            return self._read(self._conn, conversation_id)
+
+    def delete_lock(self, conversation_id: Text) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM locks WHERE conversation_id = ?", (conversation_id,))
+
+    def save_lock(self, lock: TicketLock) -> None:
+        with self._transaction() as conn:
+            self._write(conn, lock)
+
+    def issue_ticket(self, conversation_id: Text, lock_lifetime: float = LOCK_LIFETIME) -> int:
+        with self._transaction() as conn:
+            lock = self._read(conn, conversation_id) or self.create_lock(conversation_id)
+            ticket = lock.issue_ticket(lock_lifetime)
+            self._write(conn, lock)
+            return ticket
+
+    def update_lock(self, conversation_id: Text) -> None:
+        with self._transaction() as conn:
+            lock = self._read(conn, conversation_id)
+            if lock:
+                lock.remove_expired_tickets()
+                self._write(conn, lock)
+
+    def finish_serving(self, conversation_id: Text, ticket_number: int) -> None:
+        with self._transaction() as conn:
+            lock = self._read(conn, conversation_id)
+            if lock:
+                lock.remove_ticket_for(ticket_number)
+                self._write(conn, lock)
+
+    def cleanup(self, conversation_id: Text, ticket_number: int) -> None:
+        # Release the ticket and drop the row in one step, so a ticket issued
+        # by another replica in between is never deleted with it
+        with self._transaction() as conn:
+            lock = self._read(conn, conversation_id)
+            if not lock:
+                return
+            lock.remove_ticket_for(ticket_number)
+            if lock.is_someone_waiting():
+                self._write(conn, lock)
+            else:
+                conn.execute("DELETE FROM locks WHERE conversation_id = ?", (conversation_id,))
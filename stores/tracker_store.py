@@ -0,0 +1,153 @@
+import json
+import logging
+from typing import Any, Iterable, List, Optional, Text
+
+import sqlalchemy as sa
+
+from rasa.core.brokers.broker import EventBroker
+from rasa.core.tracker_store import SQLTrackerStore
+from rasa.shared.core.domain import Domain
+from rasa.shared.core.events import ActiveLoop, Event, SessionStarted, SlotSet, UserUttered
+from rasa.shared.core.trackers import DialogueStateTracker
+
+logger = logging.getLogger(__name__)
+
+
+class CompactingSQLTrackerStore(SQLTrackerStore):
+    """SQL tracker store that keeps each conversation's event history bounded.
+
+    Events are indexed by ``(sender_id, timestamp)``. After every save, conversations
+    longer than ``keep_turns`` user turns are compacted: events of earlier sessions are
+    dropped and the older part of the current session is replaced by a snapshot of the
+    slot values and active loop it produced. Policies with ``max_history: 5`` only look
+    at the last five turns, so the default of ten keeps a safety margin.
+    """
+
+    def __init__(
+        self,
+        domain: Optional[Domain] = None,
+        dialect: Text = "sqlite",
+        host: Optional[Text] = None,
+        port: Optional[int] = None,
+        db: Text = "rasa.db",
+        username: Text = None,
+        password: Text = None,
+        event_broker: Optional[EventBroker] = None,
+        login_db: Optional[Text] = None,
+        query: Optional[dict] = None,
+        keep_turns: int = 10,
+        compact_every: int = 20,
+        keep_previous_sessions: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            domain=domain, dialect=dialect, host=host, port=port, db=db,
+            username=username, password=password, event_broker=event_broker,
+            login_db=login_db, query=query, **kwargs,
+        )
+        self.keep_turns = int(keep_turns)
+        # Only compact once the surplus is worth a round trip
+        self.compact_every = max(1, int(compact_every))
+        self.keep_previous_sessions = bool(keep_previous_sessions)
+        index = sa.Index("ix_events_sender_id_timestamp", self.SQLEvent.sender_id, self.SQLEvent.timestamp)
+        index.create(self.engine, checkfirst=True)
+
+    async def save(self, tracker: DialogueStateTracker) -> None:
+        await super().save(tracker)
+        try:
+            self._compact(tracker)
+        except Exception as e:
+            # Compaction is an optimization; never fail the turn because of it
+            logger.warning(f"Tracker compaction failed for '{tracker.sender_id}': {e}")
+
+    def _compact(self, tracker: DialogueStateTracker) -> None:
+        with self.session_scope() as session:
+            # Rasa replays rows in id order, so work on the stored rows rather than timestamps
+            rows = self._event_query(session, tracker.sender_id, fetch_events_from_all_sessions=False).all()
+            # In-memory events before the stored ones (earlier sessions) stay untouched
+            offset = len(tracker.events) - len(rows)
+            if offset < 0:
+                return
+            events = list(tracker.events)
+            stored = events[offset:]
+            session_start = _last_session_start(stored)
+            user_turns = [i for i, e in enumerate(stored) if isinstance(e, UserUttered) and i > session_start]
+            if len(user_turns) < self.keep_turns + self.compact_every:
+                return
+
+            cut = user_turns[-self.keep_turns]
+            # Everything between the session start and the cut collapses into a state snapshot
+            dropped = rows[session_start + 1:cut]
+            if not dropped:
+                return
+            snapshot = self._snapshot(tracker.sender_id, events[:offset + cut])
+            for event in snapshot:
+                # Within the session, so the latest-session query still returns it
+                event.timestamp = stored[cut - 1].timestamp
+
+            query = session.query(self.SQLEvent).filter(self.SQLEvent.sender_id == tracker.sender_id)
+            if not self.keep_previous_sessions and session_start >= 0:
+                query.filter(self.SQLEvent.id < rows[session_start].id).delete(synchronize_session=False)
+            # Drop the compacted rows and the tail, then write the snapshot and the tail
+            # back so the snapshot gets lower ids than the events it precedes
+            tail = [self._copy_row(row) for row in rows[cut:]]
+            query.filter(
+                self.SQLEvent.id >= dropped[0].id,
+                self.SQLEvent.id <= rows[-1].id,
+            ).delete(synchronize_session=False)
+            session.add_all([self._to_row(tracker.sender_id, event) for event in snapshot])
+            session.flush()
+            session.add_all(tail)
+            session.commit()
+
+        # Keep the in-memory tracker aligned with the stored rows, since later saves
+        # of the same tracker count stored events to find which ones are new
+        tracker.events.clear()
+        tracker.events.extend(events[:offset + session_start + 1] + snapshot + events[offset + cut:])
+        logger.debug(
+            f"Compacted tracker '{tracker.sender_id}': "
+            f"{len(dropped)} events replaced by {len(snapshot)} snapshot events."
+        )
+
+    def _snapshot(self, sender_id: Text, events: List[Event]) -> List[Event]:
+        """Events that reproduce the slot values and active loop after ``events``."""
+        slots = self.domain.slots if self.domain else []
+        replayed = DialogueStateTracker.from_events(sender_id, events, slots=slots)
+        snapshot: List[Event] = [
+            SlotSet(name, value)
+            for name, value in replayed.current_slot_values().items()
+            if value is not None
+        ]
+        if replayed.active_loop_name:
+            snapshot.append(ActiveLoop(replayed.active_loop_name))
+        return snapshot
+
+    def _to_row(self, sender_id: Text, event: Event) -> Any:
+        data = event.as_dict()
+        return self.SQLEvent(
+            sender_id=sender_id,
+            type_name=event.type_name,
+            timestamp=event.timestamp,
+            intent_name=data.get("parse_data", {}).get("intent", {}).get("name"),
+            action_name=data.get("name"),
+            data=json.dumps(data),
+        )
+
+    def _copy_row(self, row: Any) -> Any:
+        return self.SQLEvent(
+            sender_id=row.sender_id,
+            type_name=row.type_name,
+            timestamp=row.timestamp,
+            intent_name=row.intent_name,
+            action_name=row.action_name,
+            data=row.data,
+        )
+
+
+def _last_session_start(events: Iterable[Event]) -> int:
+    """Index of the last ``session_started`` event, or -1 if there is none."""
+    index = -1
+    for i, event in enumerate(events):
+        if isinstance(event, SessionStarted):
+            index = i
+    return index
@@ -1,11 +1,14 @@
 import os
 import time
 import json
-from typing import List, Dict, Any
+import random
+from typing import List, Dict, Any, Iterator, Optional
 from uuid import uuid4
 
 import requests
+import requests.adapters
 import streamlit as st
+import urllib3
 
 
 # Configuration
@@ -13,14 +16,82 @@ DEFAULT_RASA_ENDPOINT = os.getenv(
     "RASA_REST_ENDPOINT",
     "http://localhost:5006/webhooks/rest/webhook",
 )
+DEFAULT_STREAM_ENDPOINT = os.getenv(
+    "RASA_STREAM_ENDPOINT",
+    "http://localhost:5006/webhooks/sse/webhook",
+)
 STATUS_ENDPOINT = os.getenv("RASA_STATUS_ENDPOINT", "http://localhost:5006/status")
 # Derive base URL for Rasa HTTP API from status endpoint
 BASE_RASA_URL = STATUS_ENDPOINT.rsplit("/status", 1)[0]
 
 
+# Connection tuning: split connect/read timeouts and bounded, jittered retries
+CONNECT_TIMEOUT = float(os.getenv("RASA_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("RASA_READ_TIMEOUT", "15"))
+MAX_RETRIES = int(os.getenv("RASA_MAX_RETRIES", "2"))
+BACKOFF_BASE = float(os.getenv("RASA_BACKOFF_BASE", "0.3"))
+POOL_SIZE = int(os.getenv("RASA_POOL_SIZE", "10"))
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Shared keep-alive session with a connection pool, reused across reruns and users."""
+    session = requests.Session()
+    # Retries are handled in _request so we can tell idempotent calls apart
+    adapter = requests.adapters.HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff: random delay in [0, base * 2^attempt]."""
+    return random.uniform(0, BACKOFF_BASE * (2 ** attempt))
+
+
+def _never_sent(error: Exception) -> bool:
+    """True when the request provably never reached the server (safe to retry any method)."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
+def _request(method: str, url: str, idempotent: bool, timings: Optional[Dict[str, float]] = None, **kwargs) -> requests.Response:
+    """Issue a request over the pooled session.
+
+    Failures to connect are always retried since the request never reached the server.
+    Read timeouts, dropped connections and 5xx responses are retried only for idempotent calls.
+    """
+    kwargs.setdefault("timeout", (CONNECT_TIMEOUT, READ_TIMEOUT))
+    session = get_session()
+    attempts = MAX_RETRIES + 1
+    retry_waited = 0.0
+    for attempt in range(attempts):
+        started = time.perf_counter()
+        try:
+            resp = session.request(method, url, **kwargs)
+            if idempotent and resp.status_code >= 500 and attempt < attempts - 1:
+                raise requests.HTTPError(f"HTTP {resp.status_code}", response=resp)
+            if timings is not None:
+                timings["request"] = time.perf_counter() - started
+                timings["retry_wait"] = retry_waited
+                timings["attempts"] = attempt + 1
+            return resp
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            if not (idempotent or _never_sent(e)) or attempt >= attempts - 1:
+                raise
+            delay = _backoff(attempt)
+            retry_waited += delay
+            time.sleep(delay)
+    raise RuntimeError("unreachable")
+
+
 def get_status() -> Dict[str, Any]:
     try:
-        resp = requests.get(STATUS_ENDPOINT, timeout=4)
+        resp = _request("GET", STATUS_ENDPOINT, idempotent=True, timeout=(CONNECT_TIMEOUT, 4))
         if resp.ok:
             return resp.json()
         return {"error": f"Status HTTP {resp.status_code}"}
@@ -28,34 +99,111 @@ def get_status() -> Dict[str, Any]:
         return {"error": str(e)}
 
 
-def send_to_rasa(sender_id: str, message: str, endpoint: str) -> List[Dict[str, Any]]:
+def send_to_rasa(sender_id: str, message: str, endpoint: str, timings: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    """Post a user message. Not idempotent: a message that reached Rasa is never re-sent.
+
+    If ``timings`` is given it is filled with a latency breakdown (seconds).
+    """
     payload = {"sender": sender_id, "message": message}
-    last_error: Exception | None = None
-    # Simple resilience: one retry and longer timeout
-    for attempt in range(2):
-        try:
-            resp = requests.post(endpoint, json=payload, timeout=15)
-            resp.raise_for_status()
-            data = resp.json()
-            if isinstance(data, list):
-                return data
-            return [{"text": json.dumps(data)}]
-        except Exception as e:
-            last_error = e
-            time.sleep(0.6)
-    return [{"text": f"Request failed: {last_error}"}]
+    timings = timings if timings is not None else {}
+    started = time.perf_counter()
+    try:
+        resp = _request("POST", endpoint, idempotent=False, timings=timings, json=payload)
+        resp.raise_for_status()
+        parse_started = time.perf_counter()
+        data = resp.json()
+        # Time from sending the request until the response headers arrived
+        timings["ttfb"] = resp.elapsed.total_seconds()
+        timings["parse"] = time.perf_counter() - parse_started
+        # The REST channel delivers all replies at once
+        timings["first_message"] = time.perf_counter() - started
+        if isinstance(data, list):
+            return data
+        return [{"text": json.dumps(data)}]
+    except Exception as e:
+        return [{"text": f"Request failed: {e}"}]
+    finally:
+        timings["total"] = time.perf_counter() - started
+
+
+def stream_from_rasa(sender_id: str, message: str, endpoint: str, timings: Optional[Dict[str, float]] = None) -> Iterator[Dict[str, Any]]:
+    """Post a user message to the SSE channel and yield each bot message as it arrives."""
+    payload = {"sender": sender_id, "message": message}
+    timings = timings if timings is not None else {}
+    started = time.perf_counter()
+    try:
+        resp = _request("POST", endpoint, idempotent=False, timings=timings, json=payload, stream=True)
+        resp.raise_for_status()
+        timings["ttfb"] = resp.elapsed.total_seconds()
+        event = "message"
+        for line in resp.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data = json.loads(line[len("data:"):])
+                if event == "message":
+                    timings.setdefault("first_message", time.perf_counter() - started)
+                    yield data
+                elif event == "error":
+                    yield {"text": f"Bot error: {data.get('error')}"}
+                elif event == "done":
+                    break
+            elif not line:
+                event = "message"
+    except Exception as e:
+        yield {"text": f"Request failed: {e}"}
+    finally:
+        timings["total"] = time.perf_counter() - started
 
 
 def restart_conversation(sender_id: str) -> bool:
     """Send a restart event to Rasa to reset tracker for the given sender."""
     try:
         url = f"{BASE_RASA_URL}/conversations/{sender_id}/events"
-        resp = requests.post(url, json={"event": "restart"}, timeout=10)
+        # Restarting twice is harmless, so this call may be retried
+        resp = _request("POST", url, idempotent=True, json={"event": "restart"}, timeout=(CONNECT_TIMEOUT, 10))
         return resp.ok
     except Exception:
         return False
 
 
+def reply_text(r: Dict[str, Any]) -> str:
+    # Prefer text; fallback to raw structure
+    text = r.get("text")
+    if not text:
+        # Handle common fields loosely
+        if "image" in r:
+            text = f"[image] {r['image']}"
+        elif "custom" in r:
+            text = f"[custom] {json.dumps(r['custom'])}"
+        else:
+            text = json.dumps(r)
+    return text
+
+
+def converse(sender_id: str, message: str) -> None:
+    """Send a message and render the bot replies, incrementally when streaming is enabled."""
+    timings: Dict[str, float] = {}
+    with st.spinner("Contacting bot…"):
+        if st.session_state.get("stream_replies"):
+            replies = stream_from_rasa(sender_id, message, st.session_state.stream_endpoint, timings)
+        else:
+            replies = send_to_rasa(sender_id, message, st.session_state.endpoint, timings)
+        for r in replies:
+            text = reply_text(r)
+            st.session_state["messages"].append({"role": "assistant", "content": text})
+            st.chat_message("assistant").markdown(text)
+    timings["mode"] = "stream" if st.session_state.get("stream_replies") else "rest"
+    record_timings(timings)
+
+
+def record_timings(timings: Dict[str, float]) -> None:
+    """Keep the most recent per-message latency breakdowns for the sidebar."""
+    history = st.session_state.setdefault("latencies", [])
+    history.append(timings)
+    del history[:-20]
+
+
 st.set_page_config(page_title="Rasa Chatbot • Streamlit", page_icon="🤖", layout="centered")
 st.title("Rasa Chatbot (Streamlit UI)")
 
@@ -68,9 +216,17 @@ with st.sidebar:
         # Use a random default to avoid carrying old tracker state across sessions
         st.session_state.active_sender_id = f"streamlit-{uuid4().hex[:8]}"
 
+    if "stream_endpoint" not in st.session_state:
+        st.session_state.stream_endpoint = DEFAULT_STREAM_ENDPOINT
+
     endpoint = st.text_input("Rasa REST endpoint", value=st.session_state.endpoint, key="endpoint_widget")
     st.session_state.endpoint = endpoint
 
+    # Streaming renders each bot message as soon as its action has run
+    st.checkbox("Stream replies (SSE)", key="stream_replies")
+    stream_endpoint = st.text_input("Rasa streaming endpoint", value=st.session_state.stream_endpoint, key="stream_endpoint_widget")
+    st.session_state.stream_endpoint = stream_endpoint
+
     # Decouple active sender from widget state; apply only when requested
     sender_input = st.text_input("Sender ID (optional)", value="", key="sender_id_widget")
     apply_sid = st.button("Apply sender ID")
@@ -88,6 +244,26 @@ with st.sidebar:
             st.success("Server is reachable")
             st.json(status)
 
+    st.divider()
+    st.subheader("Latency")
+    latencies = st.session_state.get("latencies", [])
+    if latencies:
+        last = latencies[-1]
+        st.caption(
+            f"Last message ({last.get('mode', 'rest')}): total {last.get('total', 0) * 1000:.0f} ms · "
+            f"first message {last.get('first_message', 0) * 1000:.0f} ms · "
+            f"time to first byte {last.get('ttfb', 0) * 1000:.0f} ms · "
+            f"retry wait {last.get('retry_wait', 0) * 1000:.0f} ms · "
+            f"parse {last.get('parse', 0) * 1000:.1f} ms · "
+            f"attempts {last.get('attempts', 1)}"
+        )
+        st.line_chart({
+            "total (ms)": [t.get("total", 0) * 1000 for t in latencies],
+            "first message (ms)": [t.get("first_message", 0) * 1000 for t in latencies],
+        })
+    else:
+        st.caption("No messages sent yet.")
+
     st.divider()
     st.caption("Tip: Start your actions on port 5055 and core on 5006.")
 
@@ -109,25 +285,8 @@ if prompt:
     st.session_state["messages"].append({"role": "user", "content": prompt})
     st.chat_message("user").markdown(prompt)
 
-    # Send to Rasa
-    with st.spinner("Contacting bot…"):
-        replies = send_to_rasa(st.session_state.active_sender_id, prompt, endpoint)
-
-    # Render bot replies
-    for r in replies:
-        # Prefer text; fallback to raw structure
-        text = r.get("text")
-        if not text:
-            # Handle common fields loosely
-            if "image" in r:
-                text = f"[image] {r['image']}"
-            elif "custom" in r:
-                text = f"[custom] {json.dumps(r['custom'])}"
-            else:
-                text = json.dumps(r)
-
-        st.session_state["messages"].append({"role": "assistant", "content": text})
-        st.chat_message("assistant").markdown(text)
+    # Send to Rasa and render bot replies
+    converse(st.session_state.active_sender_id, prompt)
 
 
 col1, col2 = st.columns(2)
@@ -136,12 +295,7 @@ with col1:
         test_msg = "I need help with my order"
         st.session_state["messages"].append({"role": "user", "content": test_msg})
         st.chat_message("user").markdown(test_msg)
-        with st.spinner("Contacting bot…"):
-            replies = send_to_rasa(st.session_state.active_sender_id, test_msg, endpoint)
-        for r in replies:
-            text = r.get("text") or json.dumps(r)
-            st.session_state["messages"].append({"role": "assistant", "content": text})
-            st.chat_message("assistant").markdown(text)
+        converse(st.session_state.active_sender_id, test_msg)
     with col2:
         if st.button("Reset chat"):
             # Clear local transcript
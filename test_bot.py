@@ -45,7 +45,8 @@ def main():
     py = f'"{sys.executable}"'
     tests = [
         (f"{py} -m rasa data validate", "Step 1: Validating training data"),
-        (f"{py} -m rasa train --domain domain.yml --data data --out models", "Step 2: Training the model (this may take several minutes)"),
+        # Retrains only when training inputs changed, fine-tuning from production where possible
+        (f"{py} run_all.py --train-only", "Step 2: Training the model (this may take several minutes)"),
         (f"{py} -m rasa test nlu --nlu data/nlu.yml --cross-validation", "Step 3: Testing NLU with cross-validation"),
     ]
     
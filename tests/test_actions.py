@@ -0,0 +1,67 @@
+import pytest
+from rasa_sdk import Tracker
+from rasa_sdk.executor import CollectingDispatcher
+
+from actions import actions
+from actions.actions import ActionAnswerFaq, ActionDefaultFallback
+from actions.ticket_store import TicketStore
+
+
+class EmptyFaq:
+    def search(self, text):
+        return None
+
+
+def tracker_for(text, order_id=None):
+    return Tracker(
+        "faq-test", {"order_id": order_id}, {"text": text, "intent": {"name": "faq"}},
+        [], False, None, {}, "action_listen",
+    )
+
+
+@pytest.fixture
+def tickets(tmp_path, monkeypatch):
+    store = TicketStore(str(tmp_path / "tickets.db"), workbook=str(tmp_path / "none.xlsx"))
+    monkeypatch.setattr(actions, "_tickets", store)
+    monkeypatch.setattr(actions, "_faq", EmptyFaq())
+    return store
+
+
+def test_faq_without_match_creates_ticket_inline(tickets):
+    dispatcher = CollectingDispatcher()
+
+    events = ActionAnswerFaq().run(dispatcher, tracker_for("can I pay with crypto?", "12345"), {})
+
+    slots = {e["name"]: e["value"] for e in events if e["event"] == "slot"}
+    assert not [e for e in events if e["event"] == "followup"]
+    assert slots["problem_summary"] == "Ticket for order 12345: can I pay with crypto?"
+    assert tickets.open_for_order("12345")["issue_id"] == slots["issue_id"]
+    assert len(dispatcher.messages) == 1
+
+
+def test_faq_without_match_reuses_open_ticket(tickets):
+    tickets.add("ISSUE-OPEN01", "Earlier issue", "12345", "faq-test")
+    dispatcher = CollectingDispatcher()
+
+    events = ActionAnswerFaq().run(dispatcher, tracker_for("can I pay with crypto?", "12345"), {})
+
+    slots = {e["name"]: e["value"] for e in events if e["event"] == "slot"}
+    assert slots["issue_id"] == "ISSUE-OPEN01"
+    assert "problem_summary" not in slots
+    assert len(tickets.by_sender("faq-test")) == 1
+
+
+def test_fallback_opens_one_ticket_through_the_shared_helper(tickets):
+    dispatcher = CollectingDispatcher()
+
+    first = ActionDefaultFallback().run(dispatcher, tracker_for("blorp the frobnicator", "12345"), {})
+    again = ActionDefaultFallback().run(dispatcher, tracker_for("blorp again", "12345"), {})
+
+    slots = {e["name"]: e["value"] for e in first if e["event"] == "slot"}
+    assert slots["problem_summary"] == "Ticket for order 12345: blorp the frobnicator"
+    assert slots["fallback_count"] == 1
+    # A later fallback in a fresh conversation points at the open ticket instead
+    assert {e["name"]: e["value"] for e in again if e["event"] == "slot"} == {
+        "issue_id": slots["issue_id"], "fallback_count": 1,
+    }
+    assert len(tickets.by_sender("faq-test")) == 1
@@ -0,0 +1,66 @@
+import random
+
+from components.aho_corasick import AhoCorasick
+
+
+def brute_force(patterns, text):
+    """Try every pattern at every offset: longest match at the leftmost free start wins."""
+    keys = []
+    for pattern in patterns:
+        key = pattern.lower().strip()
+        if key and key not in keys:
+            keys.append(key)
+    lowered = text.lower()
+    matches = []
+    start = 0
+    while start < len(text):
+        hits = [
+            key for key in keys
+            if lowered.startswith(key, start)
+            and (start == 0 or not text[start - 1].isalnum())
+            and (start + len(key) == len(text) or not text[start + len(key)].isalnum())
+        ]
+        if hits:
+            key = max(hits, key=len)
+            matches.append((start, start + len(key), keys.index(key)))
+            start += len(key)
+        else:
+            start += 1
+    return matches
+
+
+def surfaces(patterns, text):
+    return [text[start:end] for start, end, _ in AhoCorasick(patterns).find(text)]
+
+
+def test_matches_only_on_word_boundaries():
+    patterns = ["cable", "usb-c cable", "mouse"]
+
+    assert surfaces(patterns, "a USB-C Cable and a mouse") == ["USB-C Cable", "mouse"]
+    assert surfaces(patterns, "cables, mousepad, micromouse") == []
+    assert surfaces(patterns, "(cable).") == ["cable"]
+
+
+def test_prefers_leftmost_then_longest():
+    patterns = ["laptop", "laptop stand", "stand", "stand lamp", "desk"]
+
+    # "laptop stand" starts first and is longest there, so "stand lamp" cannot overlap it
+    assert surfaces(patterns, "my laptop stand lamp") == ["laptop stand"]
+    assert surfaces(patterns, "a desk stand lamp") == ["desk", "stand lamp"]
+
+
+def test_pattern_ids_follow_first_insertion():
+    matcher = AhoCorasick(["Mouse", "mouse ", "", "Webcam"])
+
+    assert len(matcher) == 2
+    assert [matcher.patterns[pid] for _, _, pid in matcher.find("webcam and MOUSE")] == ["Webcam", "Mouse"]
+
+
+def test_agrees_with_brute_force_on_random_text():
+    rng = random.Random(7)
+    words = ["ab", "abc", "b", "bc", "c", "cab", "a b", "ab c", "bca"]
+    alphabet = "abc  -"
+    for _ in range(500):
+        patterns = rng.sample(words, rng.randint(1, len(words)))
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert AhoCorasick(patterns).find(text) == brute_force(patterns, text), (patterns, text)
@@ -0,0 +1,51 @@
+import asyncio
+import json
+import sqlite3
+
+from analytics_job import Aggregator, connect, consume, report
+from brokers.sqlite_broker import SQLiteQueueEventBroker
+
+
+def user(sender, intent):
+    return {"event": "user", "sender_id": sender, "parse_data": {"intent": {"name": intent}}}
+
+
+def slot(sender, name, value):
+    return {"event": "slot", "sender_id": sender, "name": name, "value": value}
+
+
+def test_reused_ticket_is_not_counted_as_created(tmp_path):
+    conn = connect(tmp_path / "analytics.db")
+    aggregator = Aggregator(conn)
+    events = [
+        user("new", "report_issue"),
+        slot("new", "issue_id", "ISSUE-AAAAAA"),
+        slot("new", "problem_summary", "Ticket for order 12345: broken"),
+        user("reused", "report_issue"),
+        slot("reused", "issue_id", "ISSUE-AAAAAA"),
+    ]
+    for event in events:
+        aggregator.add(event)
+    aggregator.commit(len(events))
+
+    funnel = report(conn, 1)["ticket_funnel"]
+    assert (funnel["issue_raised"], funnel["ticket_created"]) == (2, 1)
+
+
+def test_close_flushes_when_queue_is_full(tmp_path):
+    db = str(tmp_path / "events.db")
+
+    async def fill_and_close():
+        broker = SQLiteQueueEventBroker(db=db, batch_size=2, flush_interval=0.05, max_queue=4)
+        for i in range(10):
+            broker.publish(user(f"s{i}", "greet"))
+        await broker.close()
+        return broker
+
+    broker = asyncio.run(fill_and_close())
+
+    assert not broker.is_ready()
+    assert broker.written + broker.dropped == 10
+    queue = sqlite3.connect(db)
+    assert [json.loads(body)["sender_id"] for (body,) in queue.execute("SELECT body FROM events")][:1] == ["s0"]
+    assert consume(queue, connect(tmp_path / "analytics.db"), None, 100) == broker.written
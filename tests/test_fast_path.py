@@ -0,0 +1,63 @@
+import pytest
+from rasa.engine.graph import ExecutionContext, GraphSchema
+from rasa.engine.storage.local_model_storage import LocalModelStorage
+from rasa.engine.storage.resource import Resource
+from rasa.nlu.classifiers.diet_classifier import DIETClassifier
+from rasa.shared.nlu.constants import ENTITIES, INTENT, TEXT
+from rasa.shared.nlu.training_data.message import Message
+from rasa.shared.nlu.training_data.training_data import TrainingData
+
+from components import fast_path
+from components.fast_path import FAST_PATH, RESOLVED, FastPathDIETClassifier, FastPathRouter, FastPathStats
+
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    monkeypatch.setattr(fast_path, "stats", FastPathStats(log_every=0))
+    router = FastPathRouter.create(
+        FastPathRouter.get_default_config(),
+        LocalModelStorage(tmp_path),
+        Resource("fast_path"),
+        ExecutionContext(GraphSchema({}), node_name="fast_path"),
+    )
+    router.train(TrainingData([
+        Message({TEXT: "Hello there!", INTENT: "greet"}),
+        Message({TEXT: "thanks", INTENT: "thank"}),
+        # Seen under two intents, so it must go through the classifiers
+        Message({TEXT: "ok", INTENT: "affirm"}),
+        Message({TEXT: "ok", INTENT: "thank"}),
+    ]))
+    return router
+
+
+def test_router_resolves_table_and_order_id_hits(router):
+    greeting, order, ambiguous, other = router.process([
+        Message({TEXT: "hello there"}),
+        Message({TEXT: "#12345"}),
+        Message({TEXT: "ok"}),
+        Message({TEXT: "where is my order"}),
+    ])
+
+    assert greeting.get(INTENT)["name"] == "greet" and greeting.get(RESOLVED)
+    assert order.get(INTENT)["name"] == "provide_order_id" and order.get(FAST_PATH)
+    assert [(e["entity"], e["value"], e["start"]) for e in order.get(ENTITIES)] == [("order_id", "12345", 1)]
+    assert not ambiguous.get(RESOLVED) and not other.get(RESOLVED)
+    assert fast_path.stats.as_dict()["hits"] == 2
+    assert fast_path.stats.as_dict()["hit_rate"] == 0.5
+
+
+def test_diet_skips_resolved_messages_and_records_slow_path(router, monkeypatch):
+    seen = []
+    monkeypatch.setattr(DIETClassifier, "process", lambda self, messages: seen.extend(messages) or messages)
+    diet = FastPathDIETClassifier.__new__(FastPathDIETClassifier)
+    diet.component_config = {"batch_inference": False}
+
+    messages = router.process([Message({TEXT: "thanks"}), Message({TEXT: "where is my order"})])
+    diet.process(messages)
+
+    assert [m.get(TEXT) for m in seen] == ["where is my order"]
+    stats = fast_path.stats.as_dict()
+    assert (stats["messages"], stats["hits"]) == (2, 1)
+    # One hit saved one classifier pass, timed on the one message DIET did see
+    assert fast_path.stats.slow_messages == 1
+    assert stats["estimated_ms_saved"] == round(stats["classifier_ms_per_message"], 1)
@@ -0,0 +1,39 @@
+from rasa.engine.graph import ExecutionContext, GraphSchema
+from rasa.nlu.tokenizers.whitespace_tokenizer import WhitespaceTokenizer
+from rasa.shared.nlu.constants import INTENT, TEXT
+from rasa.shared.nlu.training_data.message import Message
+from rasa.shared.nlu.training_data.training_data import TrainingData
+
+from components.hashing_featurizer import HashingFeaturizer
+
+
+def featurized(analyzer):
+    featurizer = HashingFeaturizer(
+        {**HashingFeaturizer.get_default_config(), "analyzer": analyzer, "n_features": 1024},
+        ExecutionContext(GraphSchema({}), node_name="hashing"),
+    )
+    training = TrainingData([
+        Message({TEXT: "where is my order", INTENT: "ask_order_status"}),
+        Message({TEXT: "hello", INTENT: "greet"}),
+    ])
+    WhitespaceTokenizer(WhitespaceTokenizer.get_default_config()).process_training_data(training)
+    featurizer.process_training_data(training)
+    return training.training_examples
+
+
+def test_word_analyzer_hashes_each_label_into_one_column():
+    order, greet = featurized("word")
+
+    _, order_label = order.get_sparse_features(INTENT)
+    _, greet_label = greet.get_sparse_features(INTENT)
+    assert order_label.features.nnz == 1 and order_label.features.sum() == 1
+    assert order_label.features.shape[-1] == 1024
+    assert list(order_label.features.col) != list(greet_label.features.col)
+    assert order.get_sparse_features(TEXT)[1] is not None
+
+
+def test_char_analyzer_leaves_labels_to_one_hot_encoding():
+    order, _ = featurized("char_wb")
+
+    assert order.get_sparse_features(INTENT) == (None, None)
+    assert order.get_sparse_features(TEXT)[1].features.shape[-1] == 1024
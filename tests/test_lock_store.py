@@ -0,0 +1,44 @@
+import asyncio
+
+from stores.lock_store import SQLiteLockStore
+
+
+def run_bursts(db, senders, messages):
+    """Every message enters ``store.lock(sender)`` the way MessageProcessor does; two store
+    instances on one file stand in for two core replicas."""
+    replicas = [SQLiteLockStore(db=db), SQLiteLockStore(db=db)]
+    inside = {sender: 0 for sender in senders}
+    served = {sender: [] for sender in senders}
+    overlap = {"now": 0, "max": 0}
+
+    async def handle(sender, index):
+        store = replicas[index % len(replicas)]
+        async with store.lock(sender, wait_time_in_seconds=0.005):
+            inside[sender] += 1
+            overlap["now"] += 1
+            overlap["max"] = max(overlap["max"], overlap["now"])
+            assert inside[sender] == 1, f"two messages for {sender} inside the lock"
+            served[sender].append(index)
+            # Yield mid-section, as a slow read-modify-write of the tracker would
+            await asyncio.sleep(0.01)
+            inside[sender] -= 1
+            overlap["now"] -= 1
+
+    async def main():
+        # Created in index order, so tickets are issued in index order per sender
+        await asyncio.gather(*(handle(sender, i) for i in range(messages) for sender in senders))
+
+    asyncio.run(main())
+    return replicas, served, overlap["max"]
+
+
+def test_lock_serves_each_sender_exclusively_in_ticket_order(tmp_path):
+    senders = ["alice", "bob", "carol"]
+
+    replicas, served, max_overlap = run_bursts(str(tmp_path / "locks.db"), senders, messages=8)
+
+    assert served == {sender: list(range(8)) for sender in senders}
+    # Different senders are not serialised behind each other
+    assert max_overlap > 1
+    # Every ticket was cleaned up, so no lock rows are left behind
+    assert all(replica.get_lock(sender) is None for replica in replicas for sender in senders)
@@ -0,0 +1,100 @@
+import json
+
+import pytest
+from rasa.engine.graph import ExecutionContext, GraphSchema
+from rasa.engine.storage.local_model_storage import LocalModelStorage
+from rasa.engine.storage.resource import Resource
+from rasa.nlu.tokenizers.whitespace_tokenizer import WhitespaceTokenizer
+from rasa.shared.nlu.constants import ENTITIES, ENTITY_ATTRIBUTE_TYPE, INTENT, TEXT
+from rasa.shared.nlu.training_data.message import Message
+from rasa.shared.nlu.training_data.training_data import TrainingData
+
+from components.fast_path import RESOLVED, FastPathCountVectorsFeaturizer
+from components.gazetteer import GazetteerEntityExtractor
+from components.parse_cache import PARSE_CACHE, ParseCacheLookup, ParseCacheWriter, cache
+
+
+class FakeDIET:
+    """Stands in for FastPathDIETClassifier: appends an entity unless the message is resolved."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def process(self, messages):
+        for message in messages:
+            if message.get(RESOLVED):
+                continue
+            self.calls += 1
+            message.set(INTENT, {"name": "report_issue", "confidence": 0.9}, add_to_output=True)
+            message.set(ENTITIES, message.get(ENTITIES, []) + [
+                {"entity": "issue_type", "value": "broken", "start": 0, "end": 2, "extractor": "FakeDIET"},
+            ], add_to_output=True)
+        return messages
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    orders = tmp_path / "orders.json"
+    orders.write_text(json.dumps({"12345": {"items": ["Wireless Mouse"]}}), encoding="utf-8")
+    gazetteer = GazetteerEntityExtractor({"entity": "product_name", "orders_file": str(orders), "products_file": None})
+    lookup = ParseCacheLookup({**ParseCacheLookup.get_default_config(), "log_every": 0})
+    tokenizer = WhitespaceTokenizer(WhitespaceTokenizer.get_default_config())
+    featurizer = FastPathCountVectorsFeaturizer.create(
+        FastPathCountVectorsFeaturizer.get_default_config(),
+        LocalModelStorage(tmp_path),
+        Resource("count_vectors"),
+        ExecutionContext(GraphSchema({}), node_name="count_vectors"),
+    )
+    training = TrainingData([Message({TEXT: "my wireless mouse is broken"}), Message({TEXT: "where is my order"})])
+    tokenizer.process_training_data(training)
+    featurizer.train(training)
+    diet = FakeDIET()
+    writer = ParseCacheWriter()
+    cache.bind("test-model")
+    cache.entries.clear()
+
+    def parse(text):
+        messages = [Message({TEXT: text})]
+        for component in (tokenizer, gazetteer, lookup, featurizer, diet, writer):
+            messages = component.process(messages)
+        return messages[0]
+
+    yield parse, diet
+    cache.bind(None)
+
+
+def test_repeated_message_gets_identical_entities(pipeline):
+    parse, diet = pipeline
+
+    first = parse("my wireless mouse is broken")
+    second = parse("my wireless mouse is broken")
+
+    assert second.get(PARSE_CACHE) == "hit"
+    assert diet.calls == 1
+    assert second.get(ENTITIES) == first.get(ENTITIES)
+    assert [e[ENTITY_ATTRIBUTE_TYPE] for e in second.get(ENTITIES)] == ["product_name", "issue_type"]
+    assert second.get(INTENT) == first.get(INTENT)
+
+
+def test_hit_is_not_featurized(pipeline):
+    parse, _ = pipeline
+
+    miss = parse("my wireless mouse is broken")
+    hit = parse("my wireless mouse is broken")
+
+    assert miss.features
+    assert hit.get(PARSE_CACHE) == "hit"
+    assert not hit.features
+
+
+def test_different_casing_is_parsed_again(pipeline):
+    parse, diet = pipeline
+
+    parse("my wireless mouse is broken")
+    other = parse("My Wireless Mouse is broken")
+
+    assert other.get(PARSE_CACHE) is None
+    assert diet.calls == 2
+    product = [e for e in other.get(ENTITIES) if e[ENTITY_ATTRIBUTE_TYPE] == "product_name"]
+    assert len(product) == 1
+    assert (product[0]["start"], product[0]["end"]) == (3, 17)
@@ -0,0 +1,34 @@
+import pytest
+
+from actions.ticket_store import CLOSED, OPEN, TicketStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return TicketStore(str(tmp_path / "tickets.db"), workbook=str(tmp_path / "none.xlsx"))
+
+
+def test_same_second_tickets_are_newest_first_by_insertion(store):
+    second = "2024-05-01T10:00:00Z"
+    # Random issue ids, so only the insertion order can tell them apart
+    for issue_id in ("ISSUE-C", "ISSUE-A", "ISSUE-B"):
+        store.add(issue_id, "Broken", "12345", "sender-1", timestamp=second)
+
+    assert [t["issue_id"] for t in store.by_order("12345")] == ["ISSUE-B", "ISSUE-A", "ISSUE-C"]
+    assert [t["issue_id"] for t in store.by_sender("sender-1")] == ["ISSUE-B", "ISSUE-A", "ISSUE-C"]
+    assert store.open_for_order("12345")["issue_id"] == "ISSUE-B"
+
+
+def test_closing_a_ticket_unblocks_the_order(store):
+    store.add("ISSUE-1", "Late", "12345")
+    store.add("ISSUE-2", "Still late", "12345")
+
+    assert store.close("ISSUE-2")
+    assert store.open_for_order("12345")["issue_id"] == "ISSUE-1"
+    assert store.close_for_order("12345") == 1
+    assert store.open_for_order("12345") is None
+    assert {t["status"] for t in store.by_order("12345")} == {CLOSED}
+    assert not store.close("ISSUE-404")
+
+    store.add("ISSUE-3", "Damaged", "12345")
+    assert store.open_for_order("12345")["status"] == OPEN
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from rasa.shared.core.domain import Domain
+from rasa.shared.core.events import ActionExecuted, ActiveLoop, SessionStarted, SlotSet, UserUttered
+
+from stores.tracker_store import CompactingSQLTrackerStore
+
+
+DOMAIN = Domain.from_yaml("""
+version: "3.1"
+intents: [provide_order_id, ask_return]
+slots:
+  order_id:
+    type: text
+    mappings: [{type: custom}]
+  return_reason:
+    type: text
+    mappings: [{type: custom}]
+forms:
+  order_status_form:
+    required_slots: [order_id]
+  return_form:
+    required_slots: [return_reason]
+""")
+
+
+def turn(tracker, n, *events):
+    tracker.update(UserUttered(f"message {n}", intent={"name": "provide_order_id", "confidence": 1.0}))
+    for event in events:
+        tracker.update(event)
+    tracker.update(ActionExecuted("action_listen"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CompactingSQLTrackerStore(domain=DOMAIN, db=str(tmp_path / "rasa.db"), keep_turns=3, compact_every=2)
+
+
+def test_compacted_tracker_reloads_latest_state(store):
+    async def scenario():
+        tracker = await store.get_or_create_tracker("compact", append_action_listen=False)
+        for event in (ActionExecuted("action_session_start"), SessionStarted(), ActionExecuted("action_listen")):
+            tracker.update(event)
+        turn(tracker, 0, ActiveLoop("order_status_form"), SlotSet("order_id", "11111"))
+        turn(tracker, 1, ActiveLoop(None), SlotSet("return_reason", "damaged"))
+        turn(tracker, 2, SlotSet("order_id", "22222"))
+        # The snapshot taken at the cut has order_id 22222 and no active form; the
+        # kept tail then changes order_id again and starts another form
+        turn(tracker, 3, SlotSet("order_id", "33333"), ActiveLoop("return_form"))
+        turn(tracker, 4)
+        await store.save(tracker)
+        before = list(tracker.events)
+        return before, await store.retrieve("compact")
+
+    before, reloaded = asyncio.run(scenario())
+
+    assert len(reloaded.events) < len(before)
+    assert reloaded.get_slot("order_id") == "33333"
+    assert reloaded.get_slot("return_reason") == "damaged"
+    assert reloaded.active_loop_name == "return_form"
+    # Session start, then the snapshot, then the kept tail starting at a user message
+    kinds = [type(e).__name__ for e in reloaded.events]
+    assert kinds[:4] == ["SessionStarted", "SlotSet", "SlotSet", "UserUttered"]
+    assert [e.text for e in reloaded.events if isinstance(e, UserUttered)] == ["message 2", "message 3", "message 4"]
+
+
+def test_finished_form_stays_finished_across_compactions(store):
+    async def scenario():
+        tracker = await store.get_or_create_tracker("finished", append_action_listen=False)
+        tracker.update(SessionStarted())
+        turn(tracker, 0, ActiveLoop("order_status_form"))
+        for n in range(1, 12):
+            turn(tracker, n, SlotSet("order_id", str(10000 + n)), *([ActiveLoop(None)] if n == 8 else []))
+            await store.save(tracker)
+            tracker = await store.retrieve("finished")
+        return tracker
+
+    reloaded = asyncio.run(scenario())
+
+    assert reloaded.get_slot("order_id") == "10011"
+    assert reloaded.active_loop_name is None
+    assert len([e for e in reloaded.events if isinstance(e, UserUttered)]) <= 3 + 2
@@ -4,8 +4,11 @@
   const elInput = document.getElementById('input');
   const elServer = document.getElementById('serverUrl');
   const elClear = document.getElementById('clearChat');
+  const elStream = document.getElementById('streamReplies');
 
   const senderId = `web-${Date.now()}`;
+  // Messages are sent one at a time so quick double-sends reach the bot in order
+  let outbox = Promise.resolve();
 
   function addBubble(text, who = 'bot') {
     const wrap = document.createElement('div');
@@ -22,29 +25,92 @@
     elMessages.appendChild(s);
   }
 
+  function renderMessage(m) {
+    if (m.text) addBubble(m.text, 'bot');
+    if (m.image) addBubble(`[image] ${m.image}`, 'bot');
+  }
+
+  function reportTiming(mode, firstMs, totalMs) {
+    // Time-to-first-message is what the user perceives as responsiveness
+    console.info(`[chat] ${mode}: first message ${Math.round(firstMs)} ms, total ${Math.round(totalMs)} ms`);
+  }
+
+  async function sendBlocking(base, text) {
+    const started = performance.now();
+    const res = await fetch(`${base}/webhooks/rest/webhook`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ sender: senderId, message: text })
+    });
+    if (!res.ok) {
+      addSystem(`Server error: ${res.status} ${res.statusText}`);
+      return;
+    }
+    const payload = await res.json();
+    const elapsed = performance.now() - started;
+    if (Array.isArray(payload) && payload.length) {
+      for (const m of payload) renderMessage(m);
+      reportTiming('rest', elapsed, elapsed);
+    } else {
+      addSystem('No response from bot.');
+    }
+  }
+
+  async function sendStreaming(base, text) {
+    // EventSource cannot POST, so read the SSE frames from the fetch body directly
+    const started = performance.now();
+    const res = await fetch(`${base}/webhooks/sse/webhook`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream' },
+      body: JSON.stringify({ sender: senderId, message: text })
+    });
+    if (!res.ok || !res.body) {
+      addSystem(`Server error: ${res.status} ${res.statusText}`);
+      return;
+    }
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let firstMs = null;
+    let count = 0;
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let sep;
+      while ((sep = buffer.indexOf('\n\n')) >= 0) {
+        const frame = buffer.slice(0, sep);
+        buffer = buffer.slice(sep + 2);
+        let event = 'message';
+        let data = '';
+        for (const line of frame.split('\n')) {
+          if (line.startsWith('event:')) event = line.slice(6).trim();
+          else if (line.startsWith('data:')) data += line.slice(5);
+        }
+        if (!data) continue;
+        const m = JSON.parse(data);
+        if (event === 'message') {
+          if (firstMs === null) firstMs = performance.now() - started;
+          count += 1;
+          renderMessage(m);
+        } else if (event === 'error') {
+          addSystem(`Bot error: ${m.error}`);
+        }
+      }
+    }
+    if (!count) addSystem('No response from bot.');
+    else reportTiming('stream', firstMs, performance.now() - started);
+  }
+
   async function sendMessage(text) {
     const base = elServer.value || 'http://localhost:5005';
-    const url = `${base}/webhooks/rest/webhook`;
 
     addBubble(text, 'user');
     try {
-      const res = await fetch(url, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ sender: senderId, message: text })
-      });
-      if (!res.ok) {
-        addSystem(`Server error: ${res.status} ${res.statusText}`);
-        return;
-      }
-      const payload = await res.json();
-      if (Array.isArray(payload) && payload.length) {
-        for (const m of payload) {
-          if (m.text) addBubble(m.text, 'bot');
-          if (m.image) addBubble(`[image] ${m.image}`, 'bot');
-        }
+      if (elStream && elStream.checked) {
+        await sendStreaming(base, text);
       } else {
-        addSystem('No response from bot.');
+        await sendBlocking(base, text);
       }
     } catch (err) {
       addSystem(`Network error: ${String(err)}`);
@@ -56,7 +122,7 @@
     const text = elInput.value.trim();
     if (!text) return;
     elInput.value = '';
-    sendMessage(text);
+    outbox = outbox.then(() => sendMessage(text));
   });
 
   elClear.addEventListener('click', () => {